@@ -0,0 +1,82 @@
+"""Startup-time benchmark: how long importing the translator takes.
+
+Each measurement runs in a fresh interpreter so nothing is cached between
+runs. Provider backends are timed separately because they are only imported
+when TranslatorFactory.create() asks for them:
+
+    python -m benchmarks.bench_import --runs 20
+    python -m benchmarks.bench_import --providers bing,openai --importtime
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from typing import List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints the wall time of the statement in milliseconds
+_TIMER = """
+import time
+start = time.perf_counter()
+{statement}
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def time_statement(statement: str, setup: str = '', runs: int = 10) -> List[float]:
+    """Time a statement in `runs` fresh interpreters; returns milliseconds per run."""
+    code = setup + _TIMER.format(statement=statement)
+    timings = []
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True)
+        if output.returncode != 0:
+            raise RuntimeError(output.stderr.strip().splitlines()[-1] if output.stderr.strip() else f"exit code {output.returncode}")
+        timings.append(float(output.stdout.strip().splitlines()[-1]))
+    return timings
+
+
+def top_imports(module: str, count: int = 15) -> List[str]:
+    """The slowest imports (by cumulative time) reported by `python -X importtime`."""
+    output = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], cwd=ROOT, capture_output=True, text=True)
+    rows = []
+    for line in output.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        rows.append((int(cumulative), name.rstrip()))
+    return [f"{cumulative / 1000:8.1f} ms  {name}" for cumulative, name in sorted(rows, reverse=True)[:count]]
+
+
+def report(label: str, timings: Optional[List[float]], error: str = None):
+    if timings is None:
+        print(f"{label:<32} unavailable ({error})")
+        return
+    print(f"{label:<32} median {statistics.median(timings):7.1f} ms   min {min(timings):7.1f} ms   max {max(timings):7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Fresh interpreters per measurement')
+    parser.add_argument('--providers', default='google,bing,yandex,openai,deepseek,gemini', help='Comma-separated providers whose backend import to time')
+    parser.add_argument('--importtime', action='store_true', help='Also list the slowest imports of srt_translator')
+    args = parser.parse_args()
+
+    report('import srt_translator', time_statement('import srt_translator', runs=args.runs))
+    for provider in args.providers.split(','):
+        # Time only the backend import, on top of an already imported translators package
+        try:
+            timings = time_statement(f"TranslatorFactory.get({provider!r})", setup='from translators import TranslatorFactory', runs=args.runs)
+            report(f"load {provider} backend", timings)
+        except RuntimeError as e:
+            report(f"load {provider} backend", None, str(e))
+
+    if args.importtime:
+        print('\nSlowest imports of srt_translator (cumulative):')
+        for line in top_imports('srt_translator'):
+            print(line)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark of whole-file timing operations: Timeline versus per-entry string handling.
+
+    python -m benchmarks.bench_timeline --cues 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_translate import write_srt
+from srt_incremental import timestamp_range_ms
+from srt_timeline import Timeline, format_timestamp, visible_chars
+from srt_translator import SRTTranslator
+
+
+def retime_entries(entries, shift_ms: int, ratio: float, max_cps: float):
+    """The same operations as retime_timeline, re-parsing and re-formatting timestamp strings per entry."""
+    for entry in entries:
+        start, end = timestamp_range_ms(entry.timestamp)
+        entry.timestamp = f"{format_timestamp(max(0, start + shift_ms))} --> {format_timestamp(max(0, end + shift_ms))}"
+    for entry in entries:
+        start, end = timestamp_range_ms(entry.timestamp)
+        entry.timestamp = f"{format_timestamp(round(start * ratio))} --> {format_timestamp(round(end * ratio))}"
+    for entry, next_entry in zip(entries, entries[1:]):
+        start, end = timestamp_range_ms(entry.timestamp)
+        next_start = timestamp_range_ms(next_entry.timestamp)[0]
+        entry.timestamp = f"{format_timestamp(start)} --> {format_timestamp(max(start + 1, min(end, next_start)))}"
+    return [entry for entry in entries if visible_chars(entry.content) * 1000 > max_cps * (lambda t: t[1] - t[0])(timestamp_range_ms(entry.timestamp))]
+
+
+def retime_timeline(timeline: Timeline, shift_ms: int, ratio: float, max_cps: float):
+    timeline.shift(shift_ms).rescale_fps(ratio, 1.0).fix_overlaps()
+    return timeline.too_fast(max_cps)
+
+
+def measure(label: str, function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:9.1f} ms")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cues', type=int, default=100000, help='Number of cues in the synthetic file')
+    args = parser.parse_args()
+
+    # Parsing needs no translation backend
+    translator = SRTTranslator.__new__(SRTTranslator)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, 'input.srt')
+        write_srt(path, args.cues)
+
+        entries = translator.parse_srt(path)
+        timeline = translator.parse_timeline(path)
+        print(f"{args.cues} cues: shift, 25 -> 23.976 fps, overlap fix, reading speed check")
+        per_entry = measure('per-entry timestamp strings', retime_entries, entries, -1500, 25 / 23.976, 17.0)
+        columnar = measure('Timeline', retime_timeline, timeline, -1500, 25 / 23.976, 17.0)
+        print(f"speed-up: {per_entry / columnar:.1f}x")
+        measure('Timeline.save', timeline.save, os.path.join(workdir, 'output.srt'))
+
+
+if __name__ == '__main__':
+    main()
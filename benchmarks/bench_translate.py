@@ -0,0 +1,157 @@
+"""Offline throughput benchmark for SRTTranslator.translate_srt.
+
+Runs the full pipeline against local mock provider servers, so no API keys
+or network access are needed:
+
+    python -m benchmarks.bench_translate --providers bing,openai --sizes 200,2000 --workers 1,8
+    python -m benchmarks.bench_translate --providers openai --chunk-delay 0.02 --stream off,on
+"""
+import argparse
+import itertools
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.mock_servers import MockBehaviour, MockProviderServer
+from srt_translator import SRTTranslator
+
+
+def write_srt(path: str, cues: int):
+    """Write a synthetic SRT file with distinct cue texts."""
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(1, cues + 1):
+            start = i * 2000
+            f.write(f"{i}\n{format_ms(start)} --> {format_ms(start + 1500)}\n")
+            f.write(f"This is subtitle line number {i}.\nIt has a second line too.\n\n")
+
+
+def format_ms(ms: int) -> str:
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def watch_first_output(path: str, started: float, result: Dict, done: threading.Event):
+    """Record how long after `started` the first bytes appear in the output file."""
+    while not done.is_set():
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            result['first_output'] = time.perf_counter() - started
+            return
+        done.wait(0.005)
+
+
+def run_case(provider: str, server: MockProviderServer, input_file: str, output_file: str, cues: int, batch_size: Optional[int], workers: int, stream: bool = False) -> Dict:
+    """Translate one file against a mock server and collect throughput figures."""
+    translator = SRTTranslator(provider, api_key='benchmark', base_url=server.url)
+    backend = translator.translator
+
+    # Time every batch_translate (or streamed batch) call as seen by the pipeline
+    latencies = []
+    latencies_lock = threading.Lock()
+    batch_translate = backend.batch_translate
+    stream_batch_translate = backend.stream_batch_translate
+
+    def timed_batch_translate(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return batch_translate(*args, **kwargs)
+        finally:
+            with latencies_lock:
+                latencies.append(time.perf_counter() - start)
+
+    def timed_stream_batch_translate(*args, **kwargs):
+        # Time the whole stream, from the request until its last cue
+        start = time.perf_counter()
+        try:
+            yield from stream_batch_translate(*args, **kwargs)
+        finally:
+            with latencies_lock:
+                latencies.append(time.perf_counter() - start)
+    backend.batch_translate = timed_batch_translate
+    backend.stream_batch_translate = timed_stream_batch_translate
+
+    if os.path.exists(output_file):
+        os.remove(output_file)
+    requests_before = server.requests
+    first_output = {}
+    done = threading.Event()
+    start = time.perf_counter()
+    watcher = threading.Thread(target=watch_first_output, args=(output_file, start, first_output, done), daemon=True)
+    watcher.start()
+    stats = translator.translate_srt(input_file, output_file, 'zh', batch_size=batch_size, max_workers=workers, deduplicate=False, stream=stream)
+    elapsed = time.perf_counter() - start
+    done.set()
+    watcher.join()
+    requests = server.requests - requests_before
+
+    return {
+        'provider': provider,
+        'cues': cues,
+        'batch_size': batch_size or 'auto',
+        'workers': workers,
+        'stream': 'on' if stream else 'off',
+        'seconds': elapsed,
+        'first_output_ms': first_output.get('first_output', elapsed) * 1000,
+        'cues_per_sec': cues / elapsed,
+        'requests': requests,
+        'requests_per_sec': requests / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'failed_batches': stats['failed_batches'],
+    }
+
+
+def print_report(rows: List[Dict]):
+    columns = ['provider', 'cues', 'batch_size', 'workers', 'stream', 'seconds', 'first_output_ms', 'cues_per_sec', 'requests', 'requests_per_sec', 'p50_ms', 'p99_ms', 'failed_batches']
+    formatted = [[f"{row[column]:.2f}" if isinstance(row[column], float) else str(row[column]) for column in columns] for row in rows]
+    widths = [max(len(column), *(len(values[i]) for values in formatted)) for i, column in enumerate(columns)]
+    print('  '.join(column.rjust(width) for column, width in zip(columns, widths)))
+    for values in formatted:
+        print('  '.join(value.rjust(width) for value, width in zip(values, widths)))
+
+
+def parse_list(value: str, convert=int) -> List:
+    return [None if item in ('auto', 'none') else convert(item) for item in value.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--providers', default='bing,yandex,openai,deepseek', help='Comma-separated providers to benchmark')
+    parser.add_argument('--sizes', default='200,2000', help='Comma-separated numbers of cues per file')
+    parser.add_argument('--batch-sizes', default='auto,10', help="Comma-separated batch sizes ('auto' uses the provider limits)")
+    parser.add_argument('--workers', default='1,8', help='Comma-separated max_workers values')
+    parser.add_argument('--stream', default='off', help="Comma-separated streaming modes to compare ('off', 'on')")
+    parser.add_argument('--latency', type=float, default=0.05, help='Mock server base latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.02, help='Mock server random extra latency in seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests failing with HTTP 500')
+    parser.add_argument('--throttle', type=float, default=None, help='Requests per second above which the server answers 429')
+    parser.add_argument('--chunk-delay', type=float, default=0.0, help='Mock generation time per chat completion chunk in seconds')
+    args = parser.parse_args()
+
+    behaviour = MockBehaviour(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate, requests_per_second=args.throttle, chunk_delay=args.chunk_delay)
+    streams = parse_list(args.stream, lambda mode: mode == 'on')
+    rows = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for provider in args.providers.split(','):
+            with MockProviderServer(provider, behaviour) as server:
+                for cues, batch_size, workers, stream in itertools.product(parse_list(args.sizes), parse_list(args.batch_sizes), parse_list(args.workers), streams):
+                    input_file = os.path.join(workdir, f"input_{cues}.srt")
+                    if not os.path.exists(input_file):
+                        write_srt(input_file, cues)
+                    rows.append(run_case(provider, server, input_file, os.path.join(workdir, 'output.srt'), cues, batch_size, workers, stream))
+    print_report(rows)
+
+
+if __name__ == '__main__':
+    main()
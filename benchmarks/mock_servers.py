@@ -0,0 +1,177 @@
+import gzip
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+@dataclass
+class MockBehaviour:
+    """How a mock provider responds.
+
+    Attributes:
+        latency: Base response time in seconds
+        jitter: Extra random response time, uniformly drawn from [0, jitter]
+        error_rate: Fraction of requests answered with HTTP 500
+        requests_per_second: Throttle above this rate with 429 and Retry-After (None disables)
+        retry_after: Value of the Retry-After header sent with 429 responses
+        chunk_delay: Generation time of each chunk of a chat completion reply, whether or
+            not it is streamed
+    """
+    latency: float = 0.05
+    jitter: float = 0.02
+    error_rate: float = 0.0
+    requests_per_second: Optional[float] = None
+    retry_after: float = 1.0
+    chunk_delay: float = 0.0
+
+
+# Characters per streamed chat completion chunk, roughly a few tokens
+CHUNK_CHARS = 16
+
+
+class MockProviderServer:
+    """Local HTTP server mimicking one provider's request/response shape.
+
+    Supported providers are 'bing', 'yandex', and the OpenAI-compatible chat
+    completion APIs 'openai' and 'deepseek'. Translations are the source text
+    prefixed with the target language, e.g. "[zh] Hello". Chat completion
+    requests with "stream": true are answered as server-sent events.
+    """
+
+    def __init__(self, provider: str, behaviour: MockBehaviour = None):
+        if provider not in ('bing', 'yandex', 'openai', 'deepseek'):
+            raise ValueError(f"No mock server for provider '{provider}'")
+        self.provider = provider
+        self.behaviour = behaviour or MockBehaviour()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._window: List[float] = []
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if self.headers.get('Content-Encoding') == 'gzip':
+                    raw = gzip.decompress(raw)
+                body = json.loads(raw or b'null')
+                status, payload, headers = server._respond(self.path, body)
+                if status == 200 and 'choices' in payload:
+                    content = payload['choices'][0]['message']['content']
+                    chunks = [content[i:i + CHUNK_CHARS] for i in range(0, len(content), CHUNK_CHARS)]
+                    if isinstance(body, dict) and body.get('stream'):
+                        self._stream(chunks)
+                        return
+                    time.sleep(len(chunks) * server.behaviour.chunk_delay)
+                data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, chunks: List[str]):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                for chunk in chunks:
+                    time.sleep(server.behaviour.chunk_delay)
+                    self._send_event(json.dumps({'choices': [{'index': 0, 'delta': {'content': chunk}}]}, ensure_ascii=False))
+                self._send_event('[DONE]')
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _send_event(self, data: str):
+                event = f"data: {data}\n\n".encode('utf-8')
+                self.wfile.write(f"{len(event):x}\r\n".encode('ascii') + event + b'\r\n')
+                self.wfile.flush()
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockProviderServer':
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _respond(self, path: str, body):
+        behaviour = self.behaviour
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            if behaviour.requests_per_second:
+                self._window = [t for t in self._window if now - t < 1.0]
+                if len(self._window) >= behaviour.requests_per_second:
+                    self.throttled += 1
+                    return 429, {'error': 'Too Many Requests'}, {'Retry-After': str(behaviour.retry_after)}
+                self._window.append(now)
+
+        time.sleep(behaviour.latency + random.uniform(0, behaviour.jitter))
+        if random.random() < behaviour.error_rate:
+            with self._lock:
+                self.errors += 1
+            return 500, {'error': 'Internal Server Error'}, {}
+
+        if self.provider == 'bing':
+            target = parse_qs(urlparse(path).query).get('to', [''])[0]
+            return 200, [
+                {'detectedLanguage': {'language': 'en', 'score': 1.0},
+                 'translations': [{'text': f"[{target}] {item['text']}", 'to': target}]}
+                for item in body
+            ], {}
+        if self.provider == 'yandex':
+            target = body['targetLanguageCode']
+            return 200, {'translations': [
+                {'text': f"[{target}] {text}", 'detectedLanguageCode': 'en'} for text in body['texts']
+            ]}, {}
+        return 200, {'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': self._chat_reply(body['messages'])}}]}, {}
+
+    def _chat_reply(self, messages) -> str:
+        system_prompt = messages[0]['content']
+        user_prompt = messages[-1]['content']
+        try:
+            items = json.loads(user_prompt)
+        except ValueError:
+            items = None
+
+        if not isinstance(items, list):
+            target = system_prompt.split(' to ', 1)[-1].split('.', 1)[0]
+            return f"[{target}] {user_prompt}"
+        if 'each of these languages:' in system_prompt:
+            languages = system_prompt.split('each of these languages:', 1)[1].split('.', 1)[0]
+            languages = [language.strip(' "') for language in languages.split(',')]
+            return json.dumps([
+                dict({'id': item['id']}, **{language: f"[{language}] {item['text']}" for language in languages})
+                for item in items
+            ], ensure_ascii=False)
+        target = system_prompt.split(' to ', 1)[-1].split('.', 1)[0]
+        return json.dumps([{'id': item['id'], 'text': f"[{target}] {item['text']}"} for item in items], ensure_ascii=False)
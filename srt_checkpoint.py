@@ -0,0 +1,65 @@
+import os
+import json
+import hashlib
+import threading
+from typing import Dict, List, Optional
+
+
+class BatchJournal:
+    """Append-only on-disk record of translated batches, used to resume interrupted runs.
+
+    Each completed batch is written as one JSON line and fsynced before the
+    call returns, so a crash loses at most the batch being written; a torn
+    last line is ignored on load.
+    """
+
+    def __init__(self, path: str):
+        """Open (or create) the journal at path and load any batches already recorded."""
+        self.path = path
+        self.completed: Dict[int, List[str]] = {}
+        self._lock = threading.Lock()
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        self.completed[record['batch']] = record['contents']
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        self._file = open(path, 'a', encoding='utf-8')
+
+    @staticmethod
+    def run_key(input_file: str, settings: Dict) -> str:
+        """Hash the input file contents together with the translation settings."""
+        digest = hashlib.sha256()
+        with open(input_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        digest.update(json.dumps(settings, sort_keys=True, default=str).encode('utf-8'))
+        return digest.hexdigest()
+
+    def pop(self, batch_number: int, size: int) -> Optional[List[str]]:
+        """Take the recorded translations of a batch, if it completed in an earlier run."""
+        with self._lock:
+            contents = self.completed.pop(batch_number, None)
+        if contents is None or len(contents) != size:
+            return None
+        return contents
+
+    def record(self, batch_number: int, contents: List[str]):
+        """Durably record the translations of a completed batch."""
+        line = json.dumps({'batch': batch_number, 'contents': contents}, ensure_ascii=False) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+    def discard(self):
+        """Close and delete the journal once the run no longer needs it."""
+        self.close()
+        os.remove(self.path)
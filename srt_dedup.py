@@ -0,0 +1,50 @@
+import threading
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Tuple
+from translators.cache import normalize_text
+
+
+class Deduplicator:
+    """Shares translations of identical cue texts across batches (and files).
+
+    The first batch to claim a normalized text translates it; every other
+    occurrence waits for that translation instead of sending it again. A
+    batch always resolves its own claims before waiting on anyone else's,
+    so waits can never form a cycle.
+    """
+
+    def __init__(self):
+        self._translations: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.saved_cues = 0
+        self.saved_chars = 0
+
+    def claim(self, texts: List[str]) -> Tuple[List[int], Dict[int, Future]]:
+        """Split texts into those this caller must translate and those already claimed.
+
+        Returns the indices to translate, and a future for every other index
+        that resolves to the shared translation (or None if it failed).
+        """
+        owned = []
+        shared = {}
+        with self._lock:
+            for i, text in enumerate(texts):
+                key = normalize_text(text)
+                if key in self._translations:
+                    shared[i] = self._translations[key]
+                    self.saved_cues += 1
+                    self.saved_chars += len(text)
+                else:
+                    self._translations[key] = Future()
+                    owned.append(i)
+        return owned, shared
+
+    def resolve(self, text: str, translation: Optional[str]):
+        """Publish the translation of a claimed text; None marks it as failed."""
+        key = normalize_text(text)
+        with self._lock:
+            future = self._translations[key]
+            if translation is None:
+                # Let a later occurrence try again rather than inherit the failure
+                del self._translations[key]
+        future.set_result(translation)
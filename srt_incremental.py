@@ -0,0 +1,83 @@
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+from translators.cache import normalize_text
+
+_TIMESTAMP = re.compile(r'(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})')
+
+
+def _to_ms(match) -> int:
+    hours, minutes, seconds, millis = match.groups()
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis.ljust(3, '0'))
+
+
+def timestamp_start_ms(timestamp: str) -> Optional[int]:
+    """Start time of an SRT timestamp line in milliseconds, or None if it cannot be read."""
+    match = _TIMESTAMP.search(timestamp)
+    return _to_ms(match) if match is not None else None
+
+
+def timestamp_range_ms(timestamp: str) -> Optional[Tuple[int, int]]:
+    """Start and end time of an SRT timestamp line in milliseconds, or None if it cannot be read."""
+    times = [_to_ms(match) for match in _TIMESTAMP.finditer(timestamp)]
+    return (times[0], times[1]) if len(times) >= 2 else None
+
+
+class PreviousTranslation:
+    """Translations from an earlier version of a subtitle file, matched to revised cues.
+
+    Cues of the previous source and its translation are paired by index (or by
+    position when the indices do not line up). A revised cue reuses the
+    previous translation of a cue with the same normalized text; when that
+    text occurred several times, the occurrence closest in time wins, so
+    retimed cues still match. Cues whose previous translation is still the
+    source text, which is what a failed translation leaves behind, are sent
+    again rather than carried forward.
+    """
+
+    def __init__(self, source_entries: List, translated_entries: List, keep_identical: bool = False):
+        """Pair previous source entries with their translations.
+
+        Args:
+            source_entries: SubtitleEntry objects of the previous source file
+            translated_entries: SubtitleEntry objects of its translation
+            keep_identical: Also carry forward translations identical to their source, for
+                files where untranslated cues (names, numbers, songs) are intended
+        """
+        translated_by_index = {entry.index: entry for entry in translated_entries}
+        if len(translated_by_index) == len(translated_entries) and all(entry.index in translated_by_index for entry in source_entries):
+            pairs = [(entry, translated_by_index[entry.index]) for entry in source_entries]
+        else:
+            pairs = list(zip(source_entries, translated_entries))
+
+        self._by_text: Dict[str, List[Tuple[Optional[int], str]]] = {}
+        for source, translated in pairs:
+            if not keep_identical and normalize_text(translated.content) == normalize_text(source.content):
+                continue
+            self._by_text.setdefault(normalize_text(source.content), []).append(
+                (timestamp_start_ms(source.timestamp), translated.content)
+            )
+        self._lock = threading.Lock()
+        self.carried_cues = 0
+        self.carried_chars = 0
+
+    def lookup(self, entries: List) -> Dict[int, str]:
+        """Find previous translations for entries; returns {position in entries: translation}."""
+        carried = {}
+        for position, entry in enumerate(entries):
+            candidates = self._by_text.get(normalize_text(entry.content))
+            if not candidates:
+                continue
+            start = timestamp_start_ms(entry.timestamp)
+            if start is None or len(candidates) == 1:
+                carried[position] = candidates[0][1]
+            else:
+                carried[position] = min(
+                    candidates,
+                    key=lambda candidate: abs(candidate[0] - start) if candidate[0] is not None else float('inf')
+                )[1]
+
+        with self._lock:
+            self.carried_cues += len(carried)
+            self.carried_chars += sum(len(entries[position].content) for position in carried)
+        return carried
@@ -0,0 +1,85 @@
+import json
+from typing import Dict, List, Optional
+from translators.base import BaseTranslator, TranslationResult
+from translators.ratelimit import is_request_wide
+
+# Extra requests one failed request may be split into before its failures are given up on
+MAX_REDRIVES = 16
+
+
+def has_error(result: TranslationResult) -> bool:
+    return bool((result.metadata or {}).get('error'))
+
+
+def _may_bisect(result: TranslationResult) -> bool:
+    # Translators flag errors such as a bad key, throttling or an outage as request-wide
+    return has_error(result) and not result.metadata.get('request_wide')
+
+
+def redrive_failed(translator: BaseTranslator, texts: List[str], results: List[TranslationResult], target_language: str, source_language: Optional[str] = None, max_requests: int = MAX_REDRIVES) -> int:
+    """Re-send the texts whose results report an error, bisecting until the failing texts are isolated.
+
+    A single bad text (an unsupported character, a content filter hit, an
+    over-long line) makes many backends fail the whole request. The failed
+    texts are split in half and each half is sent again; a half that succeeds
+    keeps its translations, and only the texts still failing are split
+    further. A text that fails on its own keeps its error result, and so do
+    texts whose errors concern the whole request (a bad key, throttling, an
+    outage: see is_request_wide), since resending them in smaller pieces
+    would not help.
+
+    Args:
+        translator: Backend to send the halves to
+        texts: Texts of the failed request
+        results: Their results, replaced in place as halves succeed
+        target_language: Target language code
+        source_language: Source language code (optional)
+        max_requests: Most requests to send; failures left by then keep their error results
+
+    Returns:
+        Number of requests sent
+    """
+    groups = [[i for i, result in enumerate(results) if _may_bisect(result)]]
+    sent = 0
+    while groups and sent < max_requests:
+        group = groups.pop()
+        if len(group) < 2:
+            continue
+        middle = len(group) // 2
+        halves = []
+        for half in (group[:middle], group[middle:]):
+            if sent == max_requests:
+                break
+            halves.append(half)
+            sent += 1
+            half_texts = [texts[i] for i in half]
+            try:
+                half_results = translator.batch_translate(half_texts, target_language, source_language)
+            except Exception as e:
+                half_results = [
+                    TranslationResult(
+                        original_text=text,
+                        translated_text=text,
+                        target_language=target_language,
+                        metadata={'error': str(e), 'request_wide': is_request_wide(e)}
+                    )
+                    for text in half_texts
+                ]
+            for i, result in zip(half, half_results):
+                results[i] = result
+        groups.extend([i for i in half if _may_bisect(results[i])] for half in halves)
+    return sent
+
+
+def write_failure_report(path: str, input_file: str, untranslated: Dict[str, List[Dict]]):
+    """Write the cues left untranslated, per target language, as JSON.
+
+    Each cue is reported with its index, timestamp, source text and the backend's error.
+    """
+    report = {
+        'input_file': input_file,
+        'untranslated_cues': sum(len(cues) for cues in untranslated.values()),
+        'languages': untranslated,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
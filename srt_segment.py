@@ -0,0 +1,179 @@
+import dataclasses
+import re
+from typing import Dict, Iterable, Iterator, List
+from srt_incremental import timestamp_range_ms
+
+# Most fragments of one sentence a unit may span, and the largest pause between them
+MAX_CUES = 4
+MAX_GAP_MS = 1500
+
+# Sentence-final punctuation, optionally followed by closing quotes or brackets
+_SENTENCE_END = re.compile(r'[.!?…。！？♪]["\'”’»)\]）」』]*$')
+# A dash at the start of a line marks a change of speaker
+_DIALOGUE = re.compile(r'^\s*[-–—]', re.MULTILINE)
+# Sound descriptions such as [Music] or (laughs), wholly in brackets
+_SOUND = re.compile(r'^(?:\s*[\[(（【][^\])）】]*[\])）】])+\s*$')
+# Preferred places to cut a translation into fragments
+_CLAUSE_END = re.compile(r'[,;:，、；：.!?。！？…]["\'”’»)\]）」』]*\s*$')
+# Longest subtitle line before a fragment is wrapped onto two lines
+MAX_LINE_CHARS = 42
+
+
+def ends_sentence(content: str) -> bool:
+    return bool(_SENTENCE_END.search(content.strip()))
+
+
+def is_dialogue(content: str) -> bool:
+    return bool(_DIALOGUE.search(content))
+
+
+def stands_alone(content: str) -> bool:
+    """Whether a cue is a sound description or a song line, never part of a spoken sentence."""
+    text = content.strip()
+    return bool(_SOUND.match(text)) or text.startswith(('♪', '♫')) or text.endswith(('♪', '♫'))
+
+
+def group_sentences(entries: Iterable, max_cues: int = MAX_CUES, max_gap_ms: int = MAX_GAP_MS) -> Iterator[List]:
+    """Incrementally group consecutive entries holding fragments of one sentence.
+
+    An entry joins the previous one's group when that entry did not end a
+    sentence, follows it within max_gap_ms, and neither is dialogue with
+    speaker dashes, a sound description ([Music], (laughs)) or a song line. Grouping restarts identically at any group boundary, so
+    regrouping a run of whole groups gives the same groups.
+    """
+    group = []
+    previous_end = None
+    for entry in entries:
+        times = timestamp_range_ms(entry.timestamp)
+        if group and (times is None or previous_end is None or not 0 <= times[0] - previous_end <= max_gap_ms
+                      or len(group) >= max_cues or is_dialogue(entry.content) or stands_alone(entry.content)):
+            yield group
+            group = []
+        group.append(entry)
+        previous_end = times[1] if times is not None else None
+        if times is None or ends_sentence(entry.content) or is_dialogue(entry.content) or stands_alone(entry.content):
+            yield group
+            group = []
+    if group:
+        yield group
+
+
+def join_fragments(group: List) -> str:
+    """The text of a group of entries as one sentence; a single entry keeps its line breaks."""
+    if len(group) == 1:
+        return group[0].content
+    text = ''
+    for entry in group:
+        fragment = ' '.join(line.strip() for line in entry.content.splitlines() if line.strip())
+        # Scripts written without spaces (CJK) are joined without one
+        if text and fragment and not (_is_wide(text[-1]) and _is_wide(fragment[0])):
+            text += ' '
+        text += fragment
+    return text
+
+
+def split_translation(text: str, weights: List[float]) -> List[str]:
+    """Cut a translation into len(weights) non-empty parts sized in proportion to weights.
+
+    Cuts fall between words (or between characters for text without spaces),
+    preferably right after a clause ends.
+    """
+    count = len(weights)
+    text = text.strip()
+    if count == 1:
+        return [text]
+    if len(text) < count:
+        # Too short to share out: show it for the whole sentence
+        return [text] * count
+
+    candidates = [i + 1 for i, char in enumerate(text[:-1]) if char.isspace() and not text[i + 1].isspace()]
+    if len(candidates) < count - 1:
+        candidates = list(range(1, len(text)))
+
+    total = sum(weights) or count
+    preference = len(text) / (4 * count)
+    cuts = []
+    share = 0.0
+    for k, weight in enumerate(weights[:-1]):
+        share += weight / total
+        target = share * len(text)
+        # Leave enough candidates for the cuts still to come
+        usable = candidates[:len(candidates) - (count - 2 - k)]
+        usable = [c for c in usable if not cuts or c > cuts[-1]]
+        cuts.append(min(usable, key=lambda c: abs(c - target) - (preference if _CLAUSE_END.search(text[:c]) else 0)))
+
+    bounds = [0] + cuts + [len(text)]
+    return [text[start:end].strip() for start, end in zip(bounds, bounds[1:])]
+
+
+def wrap_line(text: str, lines: int) -> str:
+    """Break a long fragment onto two lines at the space nearest its middle, if the original cue used several lines."""
+    if lines < 2 or len(text) <= MAX_LINE_CHARS or ' ' not in text:
+        return text
+    middle = len(text) // 2
+    space = min((i for i, char in enumerate(text) if char == ' '), key=lambda i: abs(i - middle))
+    return f"{text[:space]}\n{text[space + 1:]}"
+
+
+def _is_wide(char: str) -> bool:
+    # CJK scripts and punctuation, Hangul syllables, fullwidth forms
+    return '\u2e80' <= char <= '\u9fff' or '\uac00' <= char <= '\ud7af' or '\uff00' <= char <= '\uffef'
+
+
+class SentenceUnits:
+    """The sentence units of one batch, translated in place of its cues.
+
+    `units` holds one entry per sentence, carrying the joined text of its
+    cues. Once a unit's content is translated, `redistribute` spreads it back
+    over the original cues in proportion to their durations and lengths; a
+    unit left untranslated restores its cues' original text.
+    """
+
+    def __init__(self, entries: List):
+        self.groups = list(group_sentences(entries))
+        self.units = [dataclasses.replace(group[0], content=join_fragments(group)) for group in self.groups]
+        self.sources = [unit.content for unit in self.units]
+        self.originals = [[entry.content for entry in group] for group in self.groups]
+        self.positions: List[List[int]] = []
+        position = 0
+        for group in self.groups:
+            self.positions.append(list(range(position, position + len(group))))
+            position += len(group)
+
+    def redistribute(self, unit: int):
+        group = self.groups[unit]
+        translated = self.units[unit].content
+        if len(group) == 1:
+            group[0].content = translated
+            return
+        if translated == self.sources[unit]:
+            # Failed (or left as is): keep the original cues rather than re-cutting them
+            for entry, original in zip(group, self.originals[unit]):
+                entry.content = original
+            return
+
+        durations = [end - start for start, end in (timestamp_range_ms(entry.timestamp) for entry in group)]
+        lengths = [len(original) for original in self.originals[unit]]
+        weights = [
+            0.5 * duration / (sum(durations) or 1) + 0.5 * length / (sum(lengths) or 1)
+            for duration, length in zip(durations, lengths)
+        ]
+        for entry, original, part in zip(group, self.originals[unit], split_translation(translated, weights)):
+            entry.content = wrap_line(part, len(original.splitlines()))
+
+    def redistribute_all(self):
+        for unit in range(len(self.units)):
+            self.redistribute(unit)
+
+
+class UnitProgress:
+    """Relays progress on sentence units to the cues they span, redistributing each unit first."""
+
+    def __init__(self, progress, units: Dict[str, SentenceUnits]):
+        self.progress = progress
+        self.units = units
+
+    def mark(self, language: str, position: int):
+        self.units[language].redistribute(position)
+        for i in self.units[language].positions[position]:
+            self.progress.mark(language, i)
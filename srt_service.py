@@ -0,0 +1,391 @@
+"""Long-running translation service: a job queue in front of warm SRTTranslator instances.
+
+Translator backends (and their SDK clients, HTTP sessions and translation
+cache) are created once and reused by every job. Jobs are submitted over a
+small JSON HTTP API, on a TCP port or a Unix socket:
+
+    python srt_service.py --config translators.json --port 8765 --workers 2
+
+    POST   /jobs                  submit {"translator", "target_language", "srt", ...}
+    GET    /jobs                  list jobs
+    GET    /jobs/<id>             job status and statistics
+    GET    /jobs/<id>/result      translated SRT (?lang=<code> for multi-language jobs)
+    DELETE /jobs/<id>             cancel a queued job, or delete a finished one
+    GET    /metrics               Prometheus metrics of all jobs
+"""
+import argparse
+import itertools
+import json
+import os
+import queue
+import re
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlparse
+from translators.cache import TranslationCache
+from translators.metrics import metrics
+from srt_translator import SRTTranslator
+
+# Language codes a job may use (BCP 47 style, e.g. 'zh', 'pt-BR', 'zh-Hans')
+LANGUAGE_CODE = re.compile(r'[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})*')
+
+# translate_srt options a job may set, and the types they accept
+JOB_OPTIONS = {
+    'source_language': str,
+    'batch_size': int,
+    'max_workers': int,
+    'deduplicate': bool,
+    'combine_languages': bool,
+    'merge_sentences': bool,
+    'max_redrives': int,
+}
+
+
+@dataclass
+class Job:
+    id: str
+    translator: str
+    target_languages: List[str]
+    priority: int = 0
+    options: Dict = field(default_factory=dict)
+    status: str = 'queued'
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    stats: Optional[Dict] = None
+    error: Optional[str] = None
+    input_file: str = ''
+    outputs: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        return {
+            'id': self.id,
+            'status': self.status,
+            'translator': self.translator,
+            'target_languages': self.target_languages,
+            'priority': self.priority,
+            'options': self.options,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'stats': self.stats,
+            'error': self.error,
+        }
+
+
+class JobError(Exception):
+    """A request the service rejects; carries the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class TranslationService:
+    """Queues translation jobs by priority and runs them on a pool of worker threads."""
+
+    def __init__(self, translators: Dict[str, Dict], workers: int = 2, work_dir: Optional[str] = None, cache: Optional[TranslationCache] = None, warm: bool = True, max_job_workers: int = 4):
+        """Create the service; call `start` to begin processing.
+
+        Args:
+            translators: Translator configurations by name, e.g. {'bing': {'api_key': ...}};
+                jobs can only use these
+            workers: Number of jobs processed at once
+            work_dir: Directory for job inputs and results (a temporary directory by default)
+            cache: Translation memory shared by all jobs (optional)
+            warm: Create every translator up front instead of on its first job
+            max_job_workers: Upper bound of the max_workers option of a job
+        """
+        self.configs = translators
+        self.workers = workers
+        self.max_job_workers = max(1, max_job_workers)
+        self.cache = cache
+        self._own_work_dir = work_dir is None
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix='srt_service_')
+        self.jobs: Dict[str, Job] = {}
+        self._translators: Dict[str, SRTTranslator] = {}
+        self._queue: 'queue.PriorityQueue[Tuple[int, int, Optional[str]]]' = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        if warm:
+            for name in translators:
+                self.translator(name)
+
+    def translator(self, name: str) -> SRTTranslator:
+        """The warm SRTTranslator of a configured backend, created on first use."""
+        with self._lock:
+            if name not in self._translators:
+                if name not in self.configs:
+                    raise JobError(f"Translator '{name}' is not configured. Available translators: {list(self.configs)}")
+                self._translators[name] = SRTTranslator(name, cache=self.cache, **self.configs[name])
+            return self._translators[name]
+
+    def start(self):
+        for _ in range(self.workers):
+            thread = threading.Thread(target=self._work, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Finish running jobs and stop the workers; queued jobs stay queued."""
+        for _ in self._threads:
+            # Sentinels sort before every job, so each worker takes one next
+            self._queue.put((float('-inf'), next(self._sequence), None))
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._own_work_dir:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def submit(self, request: Dict) -> Job:
+        """Validate a job request and queue it.
+
+        The request holds 'translator', 'target_language' (a code or list of codes),
+        the subtitle text in 'srt', and optionally 'priority' (higher runs first)
+        plus any of the translate_srt options in JOB_OPTIONS.
+        """
+        if not isinstance(request, dict):
+            raise JobError("Job request must be a JSON object")
+        unknown = set(request) - {'translator', 'target_language', 'srt', 'priority'} - set(JOB_OPTIONS)
+        if unknown:
+            raise JobError(f"Unknown job fields: {sorted(unknown)}")
+        if not isinstance(request.get('srt'), str):
+            raise JobError("Job request needs the subtitle text in 'srt'")
+        target_language = request.get('target_language')
+        target_languages = [target_language] if isinstance(target_language, str) else target_language
+        if not target_languages or not isinstance(target_languages, list) or not all(isinstance(language, str) for language in target_languages):
+            raise JobError("'target_language' must be a language code or a list of codes")
+        for language in target_languages + ([request['source_language']] if isinstance(request.get('source_language'), str) else []):
+            # Codes end up in file names, query strings and prompts
+            if not LANGUAGE_CODE.fullmatch(language):
+                raise JobError(f"Invalid language code: {language!r}")
+        priority = request.get('priority', 0)
+        if not isinstance(priority, int) or isinstance(priority, bool):
+            raise JobError("'priority' must be an integer")
+        options = {}
+        for name, expected in JOB_OPTIONS.items():
+            if name in request:
+                if not isinstance(request[name], expected) or (expected is int and isinstance(request[name], bool)):
+                    raise JobError(f"'{name}' must be of type {expected.__name__}")
+                options[name] = request[name]
+        if 'max_workers' in options:
+            # Each job's workers share the translators' pools with every other job
+            options['max_workers'] = min(max(1, options['max_workers']), self.max_job_workers)
+        translator_name = request.get('translator')
+        if translator_name not in self.configs:
+            raise JobError(f"Translator '{translator_name}' is not configured. Available translators: {list(self.configs)}")
+
+        job = Job(id=uuid.uuid4().hex, translator=translator_name, target_languages=target_languages, priority=priority, options=options)
+        job_dir = os.path.realpath(os.path.join(self.work_dir, job.id))
+        job.outputs = {language: os.path.join(job_dir, f"output.{language}.srt") for language in target_languages}
+        if any(os.path.dirname(os.path.realpath(output)) != job_dir for output in job.outputs.values()):
+            raise JobError("Output files must stay inside the job directory")
+        os.makedirs(job_dir)
+        job.input_file = os.path.join(job_dir, 'input.srt')
+        with open(job.input_file, 'w', encoding='utf-8') as f:
+            f.write(request['srt'])
+
+        with self._lock:
+            self.jobs[job.id] = job
+        self._queue.put((-priority, next(self._sequence), job.id))
+        return job
+
+    def get(self, job_id: str) -> Job:
+        with self._lock:
+            if job_id not in self.jobs:
+                raise JobError(f"No job '{job_id}'", 404)
+            return self.jobs[job_id]
+
+    def result(self, job_id: str, language: Optional[str] = None) -> str:
+        """The translated SRT of a finished job; language is needed for multi-language jobs."""
+        job = self.get(job_id)
+        if job.status != 'done':
+            raise JobError(f"Job '{job_id}' is {job.status}", 409)
+        if language is None:
+            if len(job.target_languages) > 1:
+                raise JobError(f"Job '{job_id}' has several languages; choose one of {job.target_languages} with ?lang=")
+            language = job.target_languages[0]
+        if language not in job.outputs:
+            raise JobError(f"Job '{job_id}' has no '{language}' translation", 404)
+        with open(job.outputs[language], 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def delete(self, job_id: str) -> Job:
+        """Cancel a queued job, or remove a finished one and its files."""
+        job = self.get(job_id)
+        with self._lock:
+            if job.status == 'running':
+                raise JobError(f"Job '{job_id}' is running and cannot be cancelled", 409)
+            if job.status == 'queued':
+                # Left in the queue; workers skip it
+                job.status = 'cancelled'
+                job.finished_at = time.time()
+            else:
+                del self.jobs[job_id]
+                shutil.rmtree(os.path.dirname(job.input_file), ignore_errors=True)
+        return job
+
+    def queue_position(self, job: Job) -> Optional[int]:
+        """How many queued jobs run before this one, or None if it is not queued."""
+        if job.status != 'queued':
+            return None
+        with self._lock:
+            return sum(
+                1 for other in self.jobs.values()
+                if other.status == 'queued' and (-other.priority, other.created_at) < (-job.priority, job.created_at)
+            )
+
+    def _work(self):
+        while True:
+            _, _, job_id = self._queue.get()
+            if job_id is None:
+                return
+            with self._lock:
+                job = self.jobs.get(job_id)
+                if job is None or job.status != 'queued':
+                    continue
+                job.status = 'running'
+                job.started_at = time.time()
+            try:
+                translator = self.translator(job.translator)
+                if len(job.target_languages) == 1:
+                    output, target = job.outputs[job.target_languages[0]], job.target_languages[0]
+                else:
+                    output, target = os.path.join(os.path.dirname(job.input_file), 'output.{lang}.srt'), job.target_languages
+                stats = translator.translate_srt(job.input_file, output, target, **job.options)
+                job.stats = stats
+                job.status = 'done'
+            except Exception as e:
+                print(f"Job {job.id} failed: {e}")
+                job.error = str(e)
+                job.status = 'failed'
+            finally:
+                job.finished_at = time.time()
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    """HTTP server listening on a Unix domain socket."""
+
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+        self.socket.bind(self.server_address)
+        self.server_name = 'localhost'
+        self.server_port = 0
+
+    def get_request(self):
+        request, _ = self.socket.accept()
+        # BaseHTTPRequestHandler expects a (host, port) client address
+        return request, ('unix', 0)
+
+
+def create_server(service: TranslationService, host: str = '127.0.0.1', port: int = 8765, socket_path: Optional[str] = None) -> ThreadingHTTPServer:
+    """Create (but do not start) the HTTP API server of a service, on a TCP port or a Unix socket."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self._handle('GET')
+
+        def do_POST(self):
+            self._handle('POST')
+
+        def do_DELETE(self):
+            self._handle('DELETE')
+
+        def _handle(self, method: str):
+            url = urlparse(self.path)
+            parts = [part for part in url.path.split('/') if part]
+            try:
+                if method == 'GET' and parts == ['metrics']:
+                    self._send(200, metrics.to_prometheus(), 'text/plain; version=0.0.4')
+                elif method == 'GET' and parts == ['jobs']:
+                    with service._lock:
+                        jobs = list(service.jobs.values())
+                    self._send_json(200, {'jobs': [job.to_dict() for job in jobs]})
+                elif method == 'POST' and parts == ['jobs']:
+                    length = int(self.headers.get('Content-Length', 0))
+                    try:
+                        request = json.loads(self.rfile.read(length) or b'null')
+                    except ValueError:
+                        raise JobError("Request body is not valid JSON")
+                    job = service.submit(request)
+                    self._send_json(202, dict(job.to_dict(), queue_position=service.queue_position(job)))
+                elif method == 'GET' and len(parts) == 2 and parts[0] == 'jobs':
+                    job = service.get(parts[1])
+                    self._send_json(200, dict(job.to_dict(), queue_position=service.queue_position(job)))
+                elif method == 'GET' and len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+                    language = parse_qs(url.query).get('lang', [None])[0]
+                    self._send(200, service.result(parts[1], language), 'application/x-subrip; charset=utf-8')
+                elif method == 'DELETE' and len(parts) == 2 and parts[0] == 'jobs':
+                    self._send_json(200, service.delete(parts[1]).to_dict())
+                else:
+                    raise JobError(f"No route for {method} {url.path}", 404)
+            except JobError as e:
+                self._send_json(e.status, {'error': str(e)})
+            except Exception as e:
+                self._send_json(500, {'error': str(e)})
+
+        def _send_json(self, status: int, payload: Union[Dict, List]):
+            self._send(status, json.dumps(payload, ensure_ascii=False), 'application/json')
+
+        def _send(self, status: int, body: str, content_type: str):
+            data = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    if socket_path is not None:
+        server = UnixHTTPServer(socket_path, Handler)
+    else:
+        server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--config', required=True, help='JSON file mapping translator names to their configuration')
+    parser.add_argument('--host', default='127.0.0.1', help='Address to listen on')
+    parser.add_argument('--port', type=int, default=8765, help='Port to listen on')
+    parser.add_argument('--socket', default=None, help='Listen on this Unix socket instead of a TCP port')
+    parser.add_argument('--workers', type=int, default=2, help='Number of jobs processed at once')
+    parser.add_argument('--max-job-workers', type=int, default=4, help='Most batches one job may send at once')
+    parser.add_argument('--work-dir', default=None, help='Directory for job inputs and results')
+    parser.add_argument('--cache', default=None, help='Path of a translation memory shared by all jobs')
+    args = parser.parse_args()
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        translators = json.load(f)
+    cache = TranslationCache(args.cache) if args.cache else None
+    service = TranslationService(translators, workers=args.workers, work_dir=args.work_dir, cache=cache, max_job_workers=args.max_job_workers)
+    server = create_server(service, args.host, args.port, args.socket)
+    service.start()
+    print(f"Serving {list(translators)} on {args.socket or f'http://{args.host}:{args.port}'}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.stop()
+        if cache is not None:
+            cache.close()
+
+
+if __name__ == '__main__':
+    main()
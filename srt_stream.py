@@ -0,0 +1,39 @@
+import threading
+from typing import Dict, List
+
+
+class BatchProgress:
+    """Tracks which cues of an in-flight batch are final, per target language.
+
+    Translation workers mark cues as their translations arrive; the writer
+    waits for the contiguous run of final cues at the start of the batch to
+    grow and writes it out before the whole batch has finished.
+    """
+
+    def __init__(self, languages: List[str], size: int):
+        self.size = size
+        self._final: Dict[str, List[bool]] = {language: [False] * size for language in languages}
+        self._ready: Dict[str, int] = {language: 0 for language in languages}
+        self._condition = threading.Condition()
+
+    def mark(self, language: str, position: int):
+        """Record that the cue at position will not change any more."""
+        with self._condition:
+            final = self._final[language]
+            final[position] = True
+            ready = self._ready[language]
+            while ready < self.size and final[ready]:
+                ready += 1
+            if ready != self._ready[language]:
+                self._ready[language] = ready
+                self._condition.notify_all()
+
+    def mark_all(self, language: str):
+        for position in range(self.size):
+            self.mark(language, position)
+
+    def wait_ready(self, language: str, written: int, timeout: float) -> int:
+        """Wait until more than `written` leading cues are final (or timeout); returns how many are."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._ready[language] > written, timeout)
+            return self._ready[language]
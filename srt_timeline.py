@@ -0,0 +1,227 @@
+import math
+import re
+from array import array
+from itertools import repeat
+from operator import add, mul, sub
+from typing import Iterable, List, Optional, TextIO
+
+_TIMESTAMP = re.compile(r'^\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})(.*)$')
+# Formatting tags such as <i>, </font> or {\an8}, which are not read out
+_TAGS = re.compile(r'<[^>]*>|\{\\[^}]*\}')
+
+
+def format_timestamp(ms: int) -> str:
+    """Format milliseconds as an SRT time, e.g. 01:02:03,456."""
+    hours, ms = divmod(max(0, ms), 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{ms:03d}"
+
+
+def visible_chars(text: str) -> int:
+    """Number of characters a viewer reads: without tags and line breaks."""
+    if '<' in text or '{' in text:
+        text = _TAGS.sub('', text)
+    return len(text) - text.count('\n')
+
+
+class Cue:
+    """Lightweight view of one cue of a Timeline; attribute changes write through to the timeline."""
+
+    __slots__ = ('timeline', 'position')
+
+    def __init__(self, timeline: 'Timeline', position: int):
+        self.timeline = timeline
+        self.position = position
+
+    @property
+    def index(self) -> int:
+        return self.timeline.indices[self.position]
+
+    @property
+    def start(self) -> int:
+        return self.timeline.starts[self.position]
+
+    @start.setter
+    def start(self, ms: int):
+        self.timeline.starts[self.position] = ms
+
+    @property
+    def end(self) -> int:
+        return self.timeline.ends[self.position]
+
+    @end.setter
+    def end(self, ms: int):
+        self.timeline.ends[self.position] = ms
+
+    @property
+    def duration(self) -> int:
+        return self.end - self.start
+
+    @property
+    def content(self) -> str:
+        return self.timeline.contents[self.position]
+
+    @content.setter
+    def content(self, text: str):
+        self.timeline.contents[self.position] = text
+
+    @property
+    def timestamp(self) -> str:
+        """The cue's timestamp line, as SubtitleEntry.timestamp."""
+        return f"{format_timestamp(self.start)} --> {format_timestamp(self.end)}{self.timeline.settings[self.position]}"
+
+    def __repr__(self) -> str:
+        return f"Cue(index={self.index}, timestamp={self.timestamp!r}, content={self.content!r})"
+
+
+class Timeline:
+    """Columnar store of a subtitle file for whole-file timing operations.
+
+    Start and end times live in integer millisecond arrays, parsed once, and
+    every operation runs over all cues at once instead of re-parsing
+    timestamp strings per entry. Operations change the timeline in place and
+    return it, so they can be chained:
+
+        timeline.shift(-1500).rescale_fps(25, 23.976).fix_overlaps().save('out.srt')
+    """
+
+    def __init__(self):
+        self.indices = array('q')
+        self.starts = array('q')
+        self.ends = array('q')
+        self.contents: List[str] = []
+        # Anything after the end time on the timestamp line (e.g. position coordinates)
+        self.settings: List[str] = []
+
+    @classmethod
+    def from_entries(cls, entries: Iterable) -> 'Timeline':
+        """Build a timeline from SubtitleEntry objects (or anything with index, timestamp and content)."""
+        timeline = cls()
+        for entry in entries:
+            match = _TIMESTAMP.match(entry.timestamp)
+            if match is None:
+                raise ValueError(f"Cue {entry.index} has no readable timestamp: {entry.timestamp!r}")
+            groups = match.groups()
+            timeline.indices.append(entry.index)
+            timeline.starts.append(_to_ms(groups[0:4]))
+            timeline.ends.append(_to_ms(groups[4:8]))
+            timeline.contents.append(entry.content)
+            timeline.settings.append(groups[8].rstrip())
+        return timeline
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, position: int) -> Cue:
+        if not -len(self) <= position < len(self):
+            raise IndexError('cue position out of range')
+        return Cue(self, position % len(self))
+
+    def __iter__(self):
+        return (Cue(self, position) for position in range(len(self)))
+
+    def durations(self) -> array:
+        return array('q', map(sub, self.ends, self.starts))
+
+    def shift(self, ms: int, after_ms: Optional[int] = None) -> 'Timeline':
+        """Move cues by ms (negative is earlier), only those starting at or after after_ms if given.
+
+        Times are clamped at zero.
+        """
+        if after_ms is None:
+            # map() over builtins keeps the per-cue work in C
+            self.starts = array('q', map(max, repeat(0), map(add, self.starts, repeat(ms))))
+            self.ends = array('q', map(max, repeat(0), map(add, self.ends, repeat(ms))))
+        else:
+            moved = [start >= after_ms for start in self.starts]
+            self.starts = array('q', (max(0, start + ms) if move else start for start, move in zip(self.starts, moved)))
+            self.ends = array('q', (max(0, end + ms) if move else end for end, move in zip(self.ends, moved)))
+        return self
+
+    def rescale_fps(self, from_fps: float, to_fps: float) -> 'Timeline':
+        """Retime subtitles made for a video at from_fps to the same video played at to_fps."""
+        ratio = from_fps / to_fps
+        self.starts = array('q', map(round, map(mul, self.starts, repeat(ratio))))
+        self.ends = array('q', map(round, map(mul, self.ends, repeat(ratio))))
+        return self
+
+    def sort(self) -> 'Timeline':
+        """Order cues by start time, then end time; cues with equal times keep their file order."""
+        order = sorted(range(len(self)), key=lambda position: (self.starts[position], self.ends[position]))
+        self._reorder(order)
+        return self
+
+    def renumber(self, first: int = 1) -> 'Timeline':
+        self.indices = array('q', range(first, first + len(self)))
+        return self
+
+    def fix_overlaps(self, min_gap_ms: int = 0) -> 'Timeline':
+        """Cut each cue short so it ends min_gap_ms before the next one starts.
+
+        Expects cues in start order (see `sort`); a cue is never cut shorter
+        than 1 ms past its start.
+        """
+        if len(self) < 2:
+            return self
+        # max(start + 1, min(end, next start - min_gap_ms)) for every cue but the last
+        limits = map(sub, self.starts[1:], repeat(min_gap_ms))
+        ends = array('q', map(max, map(add, self.starts, repeat(1)), map(min, self.ends, limits)))
+        ends.append(self.ends[-1])
+        self.ends = ends
+        return self
+
+    def reading_speed(self) -> array:
+        """Characters per second each cue asks the viewer to read."""
+        return array('d', (
+            visible_chars(content) * 1000 / duration if duration > 0 else float('inf')
+            for content, duration in zip(self.contents, self.durations())
+        ))
+
+    def too_fast(self, max_cps: float = 17.0) -> List[int]:
+        """Positions of cues that need reading faster than max_cps characters per second."""
+        return [position for position, cps in enumerate(self.reading_speed()) if cps > max_cps]
+
+    def extend_for_reading(self, max_cps: float = 17.0, min_gap_ms: int = 0) -> 'Timeline':
+        """Lengthen cues that are too fast to read, as far as the next cue (minus min_gap_ms) allows.
+
+        Expects cues in start order.
+        """
+        needed = [
+            start + math.ceil(visible_chars(content) * 1000 / max_cps)
+            for start, content in zip(self.starts, self.contents)
+        ]
+        limits = [next_start - min_gap_ms for next_start in self.starts[1:]] + [float('inf')]
+        self.ends = array('q', (
+            int(max(end, min(need, limit)))
+            for end, need, limit in zip(self.ends, needed, limits)
+        ))
+        return self
+
+    def to_entries(self, entry_class) -> List:
+        """Convert back to entry objects, e.g. to_entries(SubtitleEntry)."""
+        return [entry_class(cue.index, cue.timestamp, cue.content) for cue in self]
+
+    def write(self, f: TextIO):
+        """Write the timeline in SRT format."""
+        f.writelines(
+            f"{index}\n{format_timestamp(start)} --> {format_timestamp(end)}{settings}\n{content}\n\n"
+            for index, start, end, content, settings in zip(self.indices, self.starts, self.ends, self.contents, self.settings)
+        )
+        f.flush()
+
+    def save(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            self.write(f)
+
+    def _reorder(self, order: List[int]):
+        self.indices = array('q', (self.indices[position] for position in order))
+        self.starts = array('q', (self.starts[position] for position in order))
+        self.ends = array('q', (self.ends[position] for position in order))
+        self.contents = [self.contents[position] for position in order]
+        self.settings = [self.settings[position] for position in order]
+
+
+def _to_ms(groups) -> int:
+    hours, minutes, seconds, millis = groups
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis.ljust(3, '0'))
@@ -1,9 +1,27 @@
-import re
+import os
+import sys
+import time
 import json
-from typing import List, Dict, Optional
+import glob
+import contextlib
+import dataclasses
+import itertools
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional, Iterable, Iterator, Set, TextIO, Tuple, Union
 from dataclasses import dataclass
 from translators import TranslatorFactory
-from translators.base import TranslationResult
+from translators.base import RequestLimits, TranslationResult, estimate_tokens
+from translators.batching import pack_batches, split_text
+from translators.cache import CachedTranslator, TranslationCache
+from translators.metrics import metrics
+from srt_checkpoint import BatchJournal
+from srt_dedup import Deduplicator
+from srt_incremental import PreviousTranslation
+from srt_redrive import MAX_REDRIVES, has_error, redrive_failed, write_failure_report
+from srt_segment import SentenceUnits, UnitProgress, group_sentences, join_fragments
+from srt_stream import BatchProgress
+from srt_timeline import Timeline
 
 
 @dataclass
@@ -13,73 +31,638 @@ class SubtitleEntry:
     content: str
 
 
+def open_srt_input(path: str) -> TextIO:
+    """Open an SRT file for reading with BOM and newline handling; '-' means stdin."""
+    if path == '-':
+        return open(sys.stdin.fileno(), 'r', encoding='utf-8-sig', closefd=False)
+    return open(path, 'r', encoding='utf-8-sig')
+
+
+def open_srt_output(path: str) -> TextIO:
+    """Open an SRT file for writing; '-' means stdout."""
+    if path == '-':
+        sys.stdout.flush()
+        return open(sys.stdout.fileno(), 'w', encoding='utf-8', closefd=False)
+    return open(path, 'w', encoding='utf-8')
+
+
+def find_srt_files(inputs: List[str]) -> List[Tuple[str, str]]:
+    """Expand files, directories and glob patterns into (path, relative output path) pairs.
+    
+    Output paths are relative to the deepest directory shared by all inputs (a
+    directory input counts as its own root, a glob pattern as the part before its
+    first wildcard), so files of the same name in different folders stay apart.
+    """
+    found = []
+    roots = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            roots.append(pattern)
+            for root, _, names in sorted(os.walk(pattern)):
+                for name in sorted(names):
+                    if name.lower().endswith('.srt'):
+                        found.append(os.path.join(root, name))
+        elif glob.has_magic(pattern):
+            root = pattern
+            while glob.has_magic(root):
+                root = os.path.dirname(root)
+            roots.append(root or '.')
+            found.extend(path for path in sorted(glob.glob(pattern, recursive=True)) if os.path.isfile(path))
+        else:
+            roots.append(os.path.dirname(pattern) or '.')
+            found.append(pattern)
+    if not found:
+        return []
+    
+    base = os.path.commonpath([os.path.abspath(root) for root in roots])
+    # The same file may match several inputs; translate it once
+    unique = {}
+    for path in found:
+        unique.setdefault(os.path.normpath(os.path.abspath(path)), (path, os.path.relpath(os.path.abspath(path), base)))
+    
+    relative_paths = {}
+    for path, relative_path in unique.values():
+        key = os.path.normcase(os.path.splitext(relative_path)[0])
+        if key in relative_paths:
+            raise ValueError(f"{relative_paths[key]} and {path} would be written to the same output file")
+        relative_paths[key] = path
+    return list(unique.values())
+
+
 class SRTTranslator:
-    def __init__(self, translator_name: str, **translator_config):
+    def __init__(self, translator_name: str, cache: Optional[TranslationCache] = None, **translator_config):
         """Initialize the translator with specified backend.
         
         Args:
             translator_name: Name of the translator backend to use
+            cache: Persistent translation memory; only cache misses are sent to the backend (optional)
             **translator_config: Configuration for the specified translator
         """
+        self.translator_name = translator_name
         self.translator = TranslatorFactory.create(translator_name, **translator_config)
+        if cache is not None:
+            self.translator = CachedTranslator(self.translator, cache, translator_name)
     
     def parse_srt(self, file_path: str) -> List[SubtitleEntry]:
         """Parse SRT file into a list of SubtitleEntry objects."""
-        entries = []
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Split file into subtitle blocks
-        blocks = re.split(r'\n\n+', content.strip())
+        with open_srt_input(file_path) as f:
+            return list(self.iter_srt(f))
+    
+    def parse_timeline(self, file_path: str) -> Timeline:
+        """Parse an SRT file into a columnar Timeline for whole-file timing operations."""
+        with open_srt_input(file_path) as f:
+            return Timeline.from_entries(self.iter_srt(f))
+    
+    def iter_srt(self, lines: Iterable[str]) -> Iterator[SubtitleEntry]:
+        """Incrementally parse SRT lines into SubtitleEntry objects.
         
-        for block in blocks:
-            lines = block.split('\n')
-            if len(lines) >= 3:
-                try:
-                    index = int(lines[0])
-                    timestamp = lines[1]
-                    text = '\n'.join(lines[2:])
-                    entries.append(SubtitleEntry(index, timestamp, text))
-                except ValueError:
-                    continue
+        Tolerates CRLF line endings, a leading BOM, blocks without an index
+        line and stray text blocks (which are skipped).
+        """
+        block = []
+        previous_index = 0
+        for line in itertools.chain(lines, ['']):
+            line = line.rstrip('\r\n').lstrip('\ufeff')
+            if line.strip():
+                block.append(line)
+                continue
+            if not block:
+                continue
+            
+            entry = self._parse_block(block, previous_index)
+            block = []
+            if entry is not None:
+                previous_index = entry.index
+                yield entry
+    
+    def _parse_block(self, lines: List[str], previous_index: int) -> Optional[SubtitleEntry]:
+        """Parse one blank-line separated block, or return None if it is malformed."""
+        try:
+            index = int(lines[0])
+            lines = lines[1:]
+        except ValueError:
+            # Missing index line: accept the block if it starts with a timestamp
+            if '-->' not in lines[0]:
+                return None
+            index = previous_index + 1
         
-        return entries
+        if len(lines) < 2:
+            return None
+        return SubtitleEntry(index, lines[0], '\n'.join(lines[1:]))
+    
+    def write_entries(self, f: TextIO, entries: Iterable[SubtitleEntry]):
+        """Write entries in SRT format and flush them to the underlying file."""
+        for entry in entries:
+            f.write(f"{entry.index}\n")
+            f.write(f"{entry.timestamp}\n")
+            f.write(f"{entry.content}\n\n")
+        f.flush()
     
-    def translate_srt(self, input_file: str, output_file: str, target_language: str, source_language: str = None, batch_size: int = 10):
+    def translate_srt(self, input_file: str, output_file: str, target_language: Union[str, List[str]], source_language: str = None, batch_size: Optional[int] = None, max_workers: int = 1, checkpoint_dir: Optional[str] = None, deduplicate: bool = True, combine_languages: bool = False, previous_source: Optional[str] = None, previous_translation: Optional[str] = None, stream: bool = False, merge_sentences: bool = False, max_redrives: int = MAX_REDRIVES, failure_report: Optional[str] = None, keep_identical: bool = False):
         """Translate entire SRT file and save to new file.
         
+        Entries are read, translated and written incrementally, so memory use is
+        bounded by the number of batches in flight rather than the file size.
+        
         Args:
-            input_file: Path to input SRT file
-            output_file: Path to output SRT file
-            target_language: Target language code
+            input_file: Path to input SRT file, or '-' for stdin
+            output_file: Path to output SRT file, or '-' for stdout; with several target
+                languages, a pattern containing '{lang}'
+            target_language: Target language code, or a list of codes to translate into at once
             source_language: Source language code (optional)
-            batch_size: Number of subtitles to translate in each batch
+            batch_size: Maximum number of subtitles in each batch (optional); batches are
+                otherwise filled up to the backend's request limits
+            max_workers: Maximum number of batches in flight at once (1 sends them sequentially)
+            checkpoint_dir: Directory for the journal of completed batches (optional); a rerun
+                with the same input and settings only sends batches that never completed
+            deduplicate: Send each distinct (normalized) cue text only once and reuse its translation
+            combine_languages: Ask for all target languages in the same request, for backends
+                that support it (the LLM translators); otherwise each language is sent separately
+            previous_source: Path to the previous version of the input file (optional)
+            previous_translation: Path to the translation of previous_source (a '{lang}' pattern
+                with several target languages); cues whose text is unchanged reuse it instead of
+                being translated again, even if their timing moved (cues the previous run left
+                in the source language are sent again, see keep_identical)
+            stream: Write each cue as soon as it and every cue before it are translated,
+                instead of a whole batch at a time; the OpenAI and DeepSeek translators then
+                also read their replies as a stream and hand out cues as the model finishes them
+            merge_sentences: Translate sentences split over several cues as one unit, then spread
+                the translation back over those cues in proportion to their durations and lengths
+            max_redrives: When the backend fails some texts of a request, up to this many extra
+                requests bisect them to isolate the cues that cause the failure and translate the
+                rest (0 turns this off)
+            failure_report: Path of a JSON report of the cues left untranslated (optional); they
+                are listed under 'untranslated' in the statistics either way
+            keep_identical: Also carry forward previous translations identical to their source,
+                for files where such cues (names, numbers, song lines) are intended
+        
+        Returns:
+            Dictionary of run statistics, or a dictionary of them per language when
+            target_language is a list
         """
-        entries = self.parse_srt(input_file)
+        target_languages = [target_language] if isinstance(target_language, str) else list(target_language)
+        if isinstance(target_language, str):
+            outputs = {target_language: output_file}
+        elif output_file == '-' or '{lang}' not in output_file:
+            raise ValueError("Translating into several languages needs an output_file pattern containing '{lang}'")
+        else:
+            outputs = {language: output_file.format(lang=language) for language in target_languages}
+        
+        max_workers = max(1, max_workers)
+        self.translator.set_max_concurrency(max_workers)
+        dedups = {language: Deduplicator() if deduplicate else None for language in target_languages}
+        previous = None
+        if previous_source is not None and previous_translation is not None:
+            previous_entries = self.parse_srt(previous_source)
+            previous = {
+                language: PreviousTranslation(previous_entries, self.parse_srt(previous_translation.format(lang=language)), keep_identical)
+                for language in target_languages
+            }
         
-        # Translate subtitles in batches
-        for i in range(0, len(entries), batch_size):
-            batch = entries[i:i + batch_size]
-            texts = [entry.content for entry in batch]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            stats = self._translate_file(input_file, outputs, source_language, batch_size, checkpoint_dir, executor, max_workers, dedups, combine_languages, previous, stream, merge_sentences, max_redrives)
+        metrics.record_run(time.perf_counter() - start, stats[target_languages[0]]['entries'])
+        
+        log_target = sys.stderr if output_file == '-' else sys.stdout
+        if merge_sentences:
+            language_stats = stats[target_languages[0]]
+            print(f"Sentence merging: {language_stats['entries']} cues sent as {language_stats['units']} units", file=log_target)
+        
+        if previous is not None:
+            for language, previous_translation in previous.items():
+                stats[language]['carried_cues'] = previous_translation.carried_cues
+            print(f"Incremental: {sum(p.carried_cues for p in previous.values())} unchanged cues carried forward", file=log_target)
+        
+        if deduplicate:
+            for language, dedup in dedups.items():
+                stats[language]['deduplicated_cues'] = dedup.saved_cues
+                stats[language]['deduplicated_chars'] = dedup.saved_chars
+            self._print_dedup_summary(dedups, log_target)
+        
+        if isinstance(self.translator, CachedTranslator):
+            hits = sum(language_stats['cache_hits'] for language_stats in stats.values())
+            misses = sum(language_stats['cache_misses'] for language_stats in stats.values())
+            print(f"Translation cache: {hits} hits, {misses} misses", file=log_target)
+        
+        untranslated = {language: language_stats['untranslated'] for language, language_stats in stats.items()}
+        if any(untranslated.values()):
+            print(f"Untranslated: {sum(len(cues) for cues in untranslated.values())} cues kept their source text"
+                  + (f" (see {failure_report})" if failure_report is not None else ""), file=log_target)
+        if failure_report is not None:
+            write_failure_report(failure_report, input_file, untranslated)
+        return stats[target_language] if isinstance(target_language, str) else stats
+    
+    def translate_files(self, inputs: List[str], output_dir: str, target_language: Union[str, List[str]], source_language: str = None, batch_size: Optional[int] = None, max_workers: int = 4, checkpoint_dir: Optional[str] = None, deduplicate: bool = True, combine_languages: bool = False, merge_sentences: bool = False, max_redrives: int = MAX_REDRIVES) -> Dict[str, Dict]:
+        """Translate many SRT files through one shared pool of batch workers.
+        
+        Batches from all files are interleaved on the same workers (and the same
+        provider rate limiter), so small files never leave workers idle. A file
+        that fails is reported and skipped without aborting the others.
+        
+        Args:
+            inputs: SRT files, directories (searched recursively) or glob patterns
+            output_dir: Directory for translated files, named <name>.<target_language>.srt and kept
+                in the folders they came from (see find_srt_files)
+            target_language: Target language code, or a list of codes
+            source_language: Source language code (optional)
+            batch_size: Maximum number of subtitles in each batch (optional)
+            max_workers: Maximum number of batches in flight at once, across all files
+            checkpoint_dir: Directory for batch journals (optional), see translate_srt
+            deduplicate: Send each distinct cue text only once across all files
+            combine_languages: Ask for all target languages in the same request, see translate_srt
+            merge_sentences: Translate sentences split over several cues as one unit, see translate_srt
+            max_redrives: Extra requests to isolate cues that fail a request, see translate_srt
+        
+        Returns:
+            Dictionary mapping each input file to its run statistics (per language when
+            target_language is a list), or to {'error': message}
+        """
+        target_languages = [target_language] if isinstance(target_language, str) else list(target_language)
+        max_workers = max(1, max_workers)
+        self.translator.set_max_concurrency(max_workers)
+        jobs = [
+            (input_file, {
+                language: os.path.join(output_dir, f"{os.path.splitext(relative_path)[0]}.{language}.srt")
+                for language in target_languages
+            })
+            for input_file, relative_path in find_srt_files(inputs)
+        ]
+        
+        dedups = {language: Deduplicator() if deduplicate else None for language in target_languages}
+        results = {}
+        total_cues = 0
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as batch_executor, \
+                ThreadPoolExecutor(max_workers=max_workers) as file_executor:
+            # File workers only read, write and wait; the actual requests run on batch_executor
+            futures = {
+                file_executor.submit(self._translate_file, input_file, outputs, source_language, batch_size,
+                                     checkpoint_dir, batch_executor, max_workers, dedups, combine_languages,
+                                     merge_sentences=merge_sentences, max_redrives=max_redrives): input_file
+                for input_file, outputs in jobs
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                input_file = futures[future]
+                try:
+                    stats = future.result()
+                    total_cues += stats[target_languages[0]]['entries']
+                    for language, language_stats in stats.items():
+                        print(f"[{done}/{len(jobs)}] {input_file} ({language}): {language_stats['entries']} entries, "
+                              f"{language_stats['batches']} batches, {language_stats['failed_batches']} failed, "
+                              f"{len(language_stats['untranslated'])} cues untranslated")
+                    results[input_file] = stats[target_language] if isinstance(target_language, str) else stats
+                except Exception as e:
+                    results[input_file] = {'error': str(e)}
+                    print(f"[{done}/{len(jobs)}] {input_file} failed: {e}")
+        metrics.record_run(time.perf_counter() - start, total_cues)
+        
+        if deduplicate:
+            self._print_dedup_summary(dedups, sys.stdout)
+        return results
+    
+    def _print_dedup_summary(self, dedups: Dict[str, Deduplicator], log_target: TextIO):
+        saved_cues = sum(dedup.saved_cues for dedup in dedups.values())
+        saved_chars = sum(dedup.saved_chars for dedup in dedups.values())
+        print(f"Deduplication: {saved_cues} repeated cues ({saved_chars} characters) not sent", file=log_target)
+    
+    def _translate_file(self, input_file: str, outputs: Dict[str, str], source_language: Optional[str], batch_size: Optional[int], checkpoint_dir: Optional[str], executor: Executor, max_workers: int, dedups: Dict[str, Optional[Deduplicator]], combine_languages: bool = False, previous: Optional[Dict[str, PreviousTranslation]] = None, stream: bool = False, merge_sentences: bool = False, max_redrives: int = MAX_REDRIVES) -> Dict[str, Dict]:
+        """Translate one file into every language in outputs, running its batches on the given executor.
+        
+        The input is parsed once; each batch is copied per target language. The statistics
+        list the cues left untranslated under 'untranslated' and, with a translation cache,
+        count this file's own cache hits and misses.
+        """
+        target_languages = list(outputs)
+        limits = self.translator.request_limits
+        if batch_size is not None:
+            limits = dataclasses.replace(limits, max_items=min(batch_size, limits.max_items or batch_size))
+        combine_languages = combine_languages and len(target_languages) > 1
+        if combine_languages and limits.max_tokens is not None:
+            # Every cue comes back once per language, so leave room in the reply
+            limits = dataclasses.replace(limits, max_tokens=max(1, limits.max_tokens // len(target_languages)))
+        cached = isinstance(self.translator, CachedTranslator)
+        stats = {
+            language: dict(
+                {'entries': 0, 'batches': 0, 'resumed_batches': 0, 'failed_batches': 0, 'untranslated': []},
+                **({'units': 0} if merge_sentences else {}),
+                **({'cache_hits': 0, 'cache_misses': 0} if cached else {})
+            )
+            for language in target_languages
+        }
+        
+        with contextlib.ExitStack() as cleanup:
+            journals = {}
+            if checkpoint_dir is not None:
+                for language in target_languages:
+                    journals[language] = self._open_journal(checkpoint_dir, input_file, limits, language, source_language, merge_sentences)
+                    cleanup.callback(journals[language].close)
+            src = cleanup.enter_context(open_srt_input(input_file))
+            destinations = {}
+            for language, output_file in outputs.items():
+                if output_file != '-':
+                    os.makedirs(os.path.dirname(output_file) or '.', exist_ok=True)
+                destinations[language] = cleanup.enter_context(open_srt_output(output_file))
+            if '-' in outputs.values():
+                # Keep progress and error messages out of the subtitle stream
+                cleanup.enter_context(contextlib.redirect_stdout(sys.stderr))
             
-            try:
-                results = self.translator.batch_translate(texts, target_language, source_language)
+            # Translate subtitles in batches; finished batches are written in cue order
+            # as soon as every batch before them is done
+            pending = deque()
+            if merge_sentences:
+                # Pack whole sentences, so no sentence is split between two batches
+                batches = (
+                    (list(itertools.chain.from_iterable(groups)), len(groups))
+                    for groups in pack_batches(group_sentences(self.iter_srt(src)), limits, join_fragments)
+                )
+            else:
+                batches = ((batch, len(batch)) for batch in pack_batches(self.iter_srt(src), limits, lambda entry: entry.content))
+            for batch_number, (batch, units) in enumerate(batches, 1):
+                copies = {
+                    language: batch if position == 0 else [dataclasses.replace(entry) for entry in batch]
+                    for position, language in enumerate(target_languages)
+                }
+                progress = BatchProgress(target_languages, len(batch)) if stream else None
+                failures = {language: {} for language in target_languages}
+                # Per batch and language, so concurrent runs on this translator never mix their counts
+                cache_counts = {language: {'cache_hits': 0, 'cache_misses': 0} for language in target_languages} if cached else None
+                if combine_languages:
+                    future = executor.submit(self._run_batch, batch_number, copies, limits, source_language, journals, dedups, previous, progress, merge_sentences, failures, max_redrives, cache_counts)
+                    futures = {language: future for language in target_languages}
+                else:
+                    futures = {
+                        language: executor.submit(self._run_batch, batch_number, {language: copy}, limits, source_language, journals, dedups, previous, progress, merge_sentences, failures, max_redrives, cache_counts)
+                        for language, copy in copies.items()
+                    }
+                pending.append((copies, futures, progress, failures, cache_counts))
+                for language_stats in stats.values():
+                    language_stats['batches'] += 1
+                    language_stats['entries'] += len(batch)
+                    if merge_sentences:
+                        language_stats['units'] += units
                 
-                # Update entries with translated text
-                for entry, result in zip(batch, results):
-                    entry.content = result.translated_text
-                    
-            except Exception as e:
-                print(f"Translation error in batch {i//batch_size + 1}: {e}")
-                # Keep original text for failed translations
-                continue
+                while len(pending) > 2 * max_workers or (pending and all(f.done() for f in pending[0][1].values())):
+                    self._write_finished(destinations, *pending.popleft(), stats)
+            
+            while pending:
+                self._write_finished(destinations, *pending.popleft(), stats)
+        
+        for language, journal in journals.items():
+            if stats[language]['failed_batches'] == 0:
+                # Everything made it to the output; nothing left to resume
+                journal.discard()
+        return stats
+    
+    def _open_journal(self, checkpoint_dir: str, input_file: str, limits: RequestLimits, target_language: str, source_language: str = None, merge_sentences: bool = False) -> BatchJournal:
+        """Open the batch journal for this input file and these translation settings."""
+        if input_file == '-':
+            raise ValueError("Checkpointing needs an input file to hash; it cannot be used with stdin")
+        settings = {
+            'translator': self.translator_name,
+            'model': getattr(self.translator, 'model', ''),
+            'target_language': target_language,
+            'source_language': source_language,
+            'limits': dataclasses.asdict(limits),
+            'merge_sentences': merge_sentences,
+        }
+        os.makedirs(checkpoint_dir, exist_ok=True)
+        run_key = BatchJournal.run_key(input_file, settings)
+        return BatchJournal(os.path.join(checkpoint_dir, f"{run_key}.jsonl"))
+    
+    def _write_finished(self, destinations: Dict[str, TextIO], copies: Dict[str, List[SubtitleEntry]], futures: Dict[str, Future], progress: Optional[BatchProgress], failures: Dict[str, Dict[int, str]], cache_counts: Optional[Dict[str, Dict[str, int]]], stats: Dict[str, Dict]):
+        """Wait for a batch's translations to finish, then write each language out.
+        
+        With progress, cues are written as soon as they and every cue before them are final.
+        Cues left untranslated and cache counts are added to the statistics.
+        """
+        for language, batch in copies.items():
+            written = 0
+            while progress is not None and not futures[language].done():
+                ready = progress.wait_ready(language, written, timeout=0.1)
+                if ready > written:
+                    self.write_entries(destinations[language], batch[written:ready])
+                    written = ready
+            status = futures[language].result()[language]
+            if status != 'translated':
+                stats[language][f'{status}_batches'] += 1
+            stats[language]['untranslated'].extend(
+                {'index': batch[i].index, 'timestamp': batch[i].timestamp, 'text': batch[i].content, 'error': reason}
+                for i, reason in sorted(failures[language].items())
+            )
+            if cache_counts is not None:
+                for key, count in cache_counts[language].items():
+                    stats[language][key] += count
+            self.write_entries(destinations[language], batch[written:])
+    
+    def _run_batch(self, batch_number: int, batches: Dict[str, List[SubtitleEntry]], limits: RequestLimits, source_language: Optional[str], journals: Dict[str, BatchJournal], dedups: Dict[str, Optional[Deduplicator]], previous: Optional[Dict[str, PreviousTranslation]] = None, progress: Optional[BatchProgress] = None, merge_sentences: bool = False, failures: Optional[Dict[str, Dict[int, str]]] = None, max_redrives: int = MAX_REDRIVES, cache_counts: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, str]:
+        """Translate a batch into each language, or restore it from the journal.
+        
+        With merge_sentences, the batch's sentence units are translated in place of its cues.
+        With failures, the positions of cues left untranslated are recorded per language;
+        with cache_counts, the cache hits and misses of its requests.
+        Returns 'translated', 'resumed' or 'failed' for each language.
+        """
+        statuses = {}
+        remaining = {}
+        for language, batch in batches.items():
+            contents = journals[language].pop(batch_number, len(batch)) if language in journals else None
+            if contents is not None:
+                for entry, content in zip(batch, contents):
+                    entry.content = content
+                statuses[language] = 'resumed'
+                if progress is not None:
+                    progress.mark_all(language)
+            else:
+                remaining[language] = batch
+        
+        if remaining:
+            if merge_sentences:
+                units = {language: SentenceUnits(batch) for language, batch in remaining.items()}
+                unit_progress = UnitProgress(progress, units) if progress is not None else None
+                unit_failures = {language: {} for language in units} if failures is not None else None
+                try:
+                    results = self._translate_batch(batch_number, {language: u.units for language, u in units.items()}, limits, source_language, dedups, previous, unit_progress, unit_failures, max_redrives, cache_counts)
+                finally:
+                    for language_units in units.values():
+                        language_units.redistribute_all()
+                if failures is not None:
+                    # A failed unit leaves every cue it spans untranslated
+                    for language, language_failures in unit_failures.items():
+                        for unit, reason in language_failures.items():
+                            failures[language].update(dict.fromkeys(units[language].positions[unit], reason))
+            else:
+                results = self._translate_batch(batch_number, remaining, limits, source_language, dedups, previous, progress, failures, max_redrives, cache_counts)
+            for language, ok in results.items():
+                statuses[language] = 'translated' if ok else 'failed'
+                if ok and language in journals:
+                    journals[language].record(batch_number, [entry.content for entry in remaining[language]])
+        return statuses
+    
+    def _translate_batch(self, batch_number: int, batches: Dict[str, List[SubtitleEntry]], limits: RequestLimits, source_language: Optional[str], dedups: Dict[str, Optional[Deduplicator]], previous: Optional[Dict[str, PreviousTranslation]] = None, progress: Optional[BatchProgress] = None, failures: Optional[Dict[str, Dict[int, str]]] = None, max_redrives: int = MAX_REDRIVES, cache_counts: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, bool]:
+        """Translate copies of one batch into each language in place; returns per language whether every entry succeeded.
+        
+        With progress, each entry is marked final as soon as its translation is in place.
+        With failures, the positions of entries left untranslated are recorded per language,
+        with the reason; cache_counts is passed on to _translate_texts.
+        """
+        texts = [entry.content for entry in next(iter(batches.values()))]
+        claims = {}
+        for language, batch in batches.items():
+            # Cues unchanged since the previous version keep their previous translation
+            carried = previous[language].lookup(batch) if previous and language in previous else {}
+            for i, translated_text in carried.items():
+                batch[i].content = translated_text
+                if progress is not None:
+                    progress.mark(language, i)
+            open_positions = [i for i in range(len(texts)) if i not in carried]
+            
+            if dedups.get(language) is not None:
+                owned, shared = dedups[language].claim([texts[i] for i in open_positions])
+                claims[language] = ([open_positions[j] for j in owned], {open_positions[j]: future for j, future in shared.items()})
+            else:
+                claims[language] = (open_positions, {})
+            if progress is not None:
+                # Duplicates are final once their first occurrence is translated
+                for i, future in claims[language][1].items():
+                    def fill_duplicate(future: Future, entry: SubtitleEntry = batch[i], language: str = language, i: int = i):
+                        if future.result() is not None:
+                            entry.content = future.result()
+                        progress.mark(language, i)
+                    future.add_done_callback(fill_duplicate)
+        # Texts some language still needs, and the languages that need anything at all
+        needed = sorted(set().union(*(owned for owned, _ in claims.values())))
+        languages = [language for language in batches if claims[language][0]]
+        position_of = {i: position for position, i in enumerate(needed)}
+        owned_by = {language: set(claims[language][0]) for language in batches}
+        published = {language: {} for language in batches}
+        
+        def publish(language: str, position: int, translated_text: Optional[str], error: Optional[str] = None):
+            """Put one translation (None if it failed) in place and share it with duplicates."""
+            i = needed[position]
+            if i not in owned_by[language] or i in published[language]:
+                return
+            published[language][i] = translated_text
+            if translated_text is None and failures is not None:
+                failures[language][i] = error or 'not translated'
+
+            if dedups.get(language) is not None:
+                dedups[language].resolve(texts[i], translated_text)
+            if translated_text is not None:
+                batches[language][i].content = translated_text
+            if progress is not None:
+                progress.mark(language, i)
+        
+        error = None
+        try:
+            if needed:
+                self._translate_texts([texts[i] for i in needed], limits, languages, source_language, publish, stream=progress is not None, max_redrives=max_redrives, cache_counts=cache_counts)
+        except Exception as e:
+            print(f"Translation error in batch {batch_number}: {e}")
+            error = str(e)
+        finally:
+            # Publish our translations before waiting on other batches, even when failing;
+            # anything not translated by now keeps its original text
+            for language in languages:
+                for i in claims[language][0]:
+                    publish(language, position_of[i], None, error)
+        
+        ok = {}
+        for language, batch in batches.items():
+            owned, shared = claims[language]
+            ok[language] = all(published[language][i] is not None for i in owned)
+            # Update duplicates with the translation of their first occurrence
+            for i, future in shared.items():
+                translated_text = future.result()
+                if translated_text is None:
+                    ok[language] = False
+                    if failures is not None:
+                        failures[language][i] = 'repeats a cue that was not translated'
+                else:
+                    batch[i].content = translated_text
+        return ok
+    
+    def _translate_texts(self, texts: List[str], limits: RequestLimits, target_languages: List[str], source_language: str = None, on_text: Optional[Callable[[str, int, Optional[str], Optional[str]], None]] = None, stream: bool = False, max_redrives: int = MAX_REDRIVES, cache_counts: Optional[Dict[str, Dict[str, int]]] = None) -> Dict[str, Tuple[List[str], Set[int]]]:
+        """Translate texts into each language, splitting any text too long for one request and re-joining its pieces.
+        
+        Args:
+            on_text: Called with (language, index, translation, error) as soon as every piece of a
+                text is translated; the translation is None and error holds the backend's message
+                if it reported an error for the text
+            stream: Let the backend hand out translations one by one as they arrive
+                (single-language requests only)
+            max_redrives: Extra requests each request with failed texts may be bisected into,
+                to translate the rest of them (see redrive_failed)
+            cache_counts: Per language, counts of results served from the translation cache
+                ('cache_hits') and by the backend ('cache_misses'), added to as results arrive
+        
+        Returns, per language, the translated texts and the indices of texts the backend reported errors for.
+        """
+        pieces = [
+            (owner, piece, separator)
+            for owner, text in enumerate(texts)
+            for piece, separator in split_text(text, limits)
+        ]
+        pieces_of = [[] for _ in texts]
+        for piece_index, (owner, _, _) in enumerate(pieces):
+            pieces_of[owner].append(piece_index)
+        
+        piece_results = {language: [None] * len(pieces) for language in target_languages}
+        pieces_left = {language: [len(owned) for owned in pieces_of] for language in target_languages}
+        translated_texts = {language: [''] * len(texts) for language in target_languages}
+        failed = {language: {} for language in target_languages}
+        
+        def finish(language: str, piece_index: int, result: TranslationResult):
+            owner = pieces[piece_index][0]
+            piece_results[language][piece_index] = result
+            metadata = result.metadata or {}
+            provider = metadata.get('provider', self.translator_name)
+            if metadata.get('error'):
+                failed[language].setdefault(owner, str(metadata['error']))
+                metrics.increment(provider, 'failed_texts')
+            elif not metadata.get('cached'):
+                metrics.record_output(provider, len(result.translated_text), estimate_tokens(result.translated_text))
+            if cache_counts is not None:
+                cache_counts[language]['cache_hits' if metadata.get('cached') else 'cache_misses'] += 1
+            
+            pieces_left[language][owner] -= 1
+            if pieces_left[language][owner] == 0:
+                translated_texts[language][owner] = ''.join(
+                    piece_results[language][j].translated_text + pieces[j][2] for j in pieces_of[owner]
+                )
+                if on_text is not None:
+                    error = failed[language].get(owner)
+                    on_text(language, owner, translated_texts[language][owner] if error is None else None, error)
         
-        # Write translated subtitles to new file
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for entry in entries:
-                f.write(f"{entry.index}\n")
-                f.write(f"{entry.timestamp}\n")
-                f.write(f"{entry.content}\n\n")
+        def redrive(language: str, request_texts: List[str], results: List[TranslationResult]):
+            if max_redrives > 0 and any(has_error(result) for result in results):
+                sent = redrive_failed(self.translator, request_texts, results, language, source_language, max_redrives)
+                metrics.increment(self.translator_name, 'redriven_requests', sent)
+        
+        for request in pack_batches(list(enumerate(pieces)), limits, lambda item: item[1][1]):
+            request_texts = [piece for _, (_, piece, _) in request]
+            if stream and len(target_languages) == 1:
+                # Failed cues are held back until re-driving has had a go at them
+                held = []
+                for position, result in self.translator.stream_batch_translate(request_texts, target_languages[0], source_language):
+                    if has_error(result):
+                        held.append((position, result))
+                    else:
+                        finish(target_languages[0], request[position][0], result)
+                held_results = [result for _, result in held]
+                redrive(target_languages[0], [request_texts[position] for position, _ in held], held_results)
+                for (position, _), result in zip(held, held_results):
+                    finish(target_languages[0], request[position][0], result)
+                continue
+            if len(target_languages) == 1:
+                results = {target_languages[0]: self.translator.batch_translate(request_texts, target_languages[0], source_language)}
+            else:
+                results = self.translator.batch_translate_multi(request_texts, target_languages, source_language)
+            for language in target_languages:
+                redrive(language, request_texts, results[language])
+                for (piece_index, _), result in zip(request, results[language]):
+                    finish(language, piece_index, result)
+        return {language: (translated_texts[language], set(failed[language])) for language in target_languages}
 
 def main():
     # Example usage with different translation backends
@@ -96,6 +679,58 @@ def main():
     # openai_translator = SRTTranslator('openai', api_key='YOUR_OPENAI_API_KEY')
     # openai_translator.translate_srt('input.srt', 'output_openai.srt', 'zh')
 
+    # # Sending up to 4 batches concurrently
+    # bing_translator.translate_srt('input.srt', 'output_bing.srt', 'zh', max_workers=4)
+
+    # # Staying within a provider quota (shared by all translators of that provider)
+    # from translators.ratelimit import configure_rate_limit
+    # configure_rate_limit('bing', requests_per_second=10, chars_per_minute=33000)
+
+    # # Resuming an interrupted run without paying for finished batches again
+    # bing_translator.translate_srt('input.srt', 'output_bing.srt', 'zh', checkpoint_dir='.srt_checkpoints')
+
+    # # Translating whole season folders on one shared worker pool
+    # bing_translator.translate_files(['season1/', 'extras/*.srt'], 'translated/', 'zh', max_workers=8)
+
+    # # Translating into several languages from one parse (one request per batch for LLMs)
+    # openai_translator.translate_srt('input.srt', 'output_{lang}.srt', ['zh', 'ja', 'ko'], combine_languages=True)
+
+    # # Re-translating a revised file, sending only cues that changed since the last version
+    # bing_translator.translate_srt('input_v2.srt', 'output_v2.srt', 'zh',
+    #                               previous_source='input_v1.srt', previous_translation='output_v1.srt')
+
+    # # Translating sentences split over several cues as a whole, keeping the original timing
+    # openai_translator.translate_srt('input.srt', 'output_openai.srt', 'zh', merge_sentences=True)
+
+    # # Isolating cues a provider rejects, translating the rest of their batch, and listing them
+    # stats = bing_translator.translate_srt('input.srt', 'output_bing.srt', 'zh', failure_report='untranslated.json')
+    # print(stats['untranslated'])
+
+    # # Live jobs: write each cue as soon as the model has finished it
+    # openai_translator.translate_srt('-', '-', 'zh', stream=True)
+
+    # # Fixing the timing of a whole file at once: 1.5s earlier, PAL to film speed, no overlaps
+    # timeline = bing_translator.parse_timeline('output_bing.srt')
+    # timeline.shift(-1500).rescale_fps(25, 23.976).sort().fix_overlaps(min_gap_ms=80).extend_for_reading(max_cps=17)
+    # timeline.save('output_bing_retimed.srt')
+
+    # # Exporting request latency, volume, retries, failures and estimated cost
+    # metrics.write_json('translation_metrics.json')
+    # metrics.write_prometheus('translation_metrics.prom')
+
+    # # Failing over to DeepSeek when OpenAI errors out, and hedging batches slower than its p95
+    # failover_translator = SRTTranslator('failover', providers=[
+    #     ('openai', {'api_key': 'YOUR_OPENAI_API_KEY'}),
+    #     ('deepseek', {'api_key': 'YOUR_DEEPSEEK_API_KEY'}),
+    # ], hedge_quantile=0.95)
+    # failover_translator.translate_srt('input.srt', 'output_failover.srt', 'zh', max_workers=4)
+    # print(failover_translator.translator.served)
+
+    # # Reusing earlier translations from a persistent translation memory
+    # cache = TranslationCache('translation_memory.db', max_entries=500000, ttl=90 * 24 * 3600)
+    # cached_translator = SRTTranslator('bing', cache=cache, api_key='YOUR_AZURE_API_KEY')
+    # cached_translator.translate_srt('input.srt', 'output_bing.srt', 'zh')
+
     # Using Gemini
     gemini_translator = SRTTranslator('gemini', api_key='')
     gemini_translator.translate_srt('input.srt', 'output_gemini.srt', 'zh')
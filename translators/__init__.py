@@ -1,17 +1,24 @@
 from .base import TranslatorFactory
 
-# Import all translator implementations
-from .google_translate import GoogleTranslator
-from .bing_translate import BingTranslator
-from .yandex_translate import YandexTranslator
-from .openai_translate import OpenAITranslator
-from .gemini_translate import GeminiTranslator
-from .deepseek_translate import DeepSeekTranslator
+# Register all available translators; each backend (and its SDK) is only
+# imported when TranslatorFactory.create() first asks for it
+_BACKENDS = {
+    'google': 'google_translate:GoogleTranslator',
+    'bing': 'bing_translate:BingTranslator',
+    'yandex': 'yandex_translate:YandexTranslator',
+    'openai': 'openai_translate:OpenAITranslator',
+    'gemini': 'gemini_translate:GeminiTranslator',
+    'deepseek': 'deepseek_translate:DeepSeekTranslator',
+    'failover': 'failover:FailoverTranslator',
+}
 
-# Register all available translators
-TranslatorFactory.register('google', GoogleTranslator)
-TranslatorFactory.register('bing', BingTranslator)
-TranslatorFactory.register('yandex', YandexTranslator)
-TranslatorFactory.register('openai', OpenAITranslator)
-TranslatorFactory.register('gemini', GeminiTranslator)
-TranslatorFactory.register('deepseek', DeepSeekTranslator)
\ No newline at end of file
+for _name, _path in _BACKENDS.items():
+    TranslatorFactory.register(_name, f"{__name__}.{_path}")
+
+
+def __getattr__(name):
+    # Keep `from translators import BingTranslator` working without eager imports
+    for backend, path in _BACKENDS.items():
+        if path.endswith(f":{name}"):
+            return TranslatorFactory.get(backend)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,6 +1,12 @@
+import time
+import importlib
 from abc import ABC, abstractmethod
-from typing import List, Dict, Type
+from typing import Callable, Iterator, List, Dict, Tuple, Type, Optional, TypeVar, Union
 from dataclasses import dataclass
+from .metrics import metrics
+from .ratelimit import RetryPolicy, call_with_retry, get_rate_limiter
+
+T = TypeVar('T')
 
 @dataclass
 class TranslationResult:
@@ -10,38 +16,137 @@ class TranslationResult:
     target_language: str = ''
     metadata: Dict = None
 
+@dataclass(frozen=True)
+class RequestLimits:
+    """Per-request limits a translation backend accepts.
+
+    Any limit left as None is unbounded. Token counts are estimates, see
+    `estimate_tokens`.
+    """
+    max_items: Optional[int] = None
+    max_chars: Optional[int] = None
+    max_tokens: Optional[int] = None
+
+    def fits(self, items: int, chars: int, tokens: int) -> bool:
+        """Check whether a request of the given size is within the limits."""
+        return ((self.max_items is None or items <= self.max_items)
+                and (self.max_chars is None or chars <= self.max_chars)
+                and (self.max_tokens is None or tokens <= self.max_tokens))
+
+
+def estimate_tokens(text: str) -> int:
+    """Conservatively estimate the number of model tokens in a text."""
+    # ~4 bytes per token for Latin scripts, ~1 token per CJK character (3 bytes)
+    return len(text.encode('utf-8')) // 3 + 1
+
+
 class BaseTranslator(ABC):
     """Base class for all translator implementations."""
     
+    # Name under which the shared rate limiter of this backend is kept
+    provider = ''
+    # Limits of a single batch_translate request; used to pack batches
+    request_limits = RequestLimits(max_items=10)
+    retry_policy = RetryPolicy()
+    
     @abstractmethod
     def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
         """Translate text to target language."""
         pass
 
-    # @abstractmethod
-    # def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
-    #     """Translate multiple texts in batch."""
-    #     return [self.translate(text, target_language, source_language) for text in texts]
+    def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
+        """Translate multiple texts in batch.
+
+        Backends with a native batch endpoint should override this; the default
+        falls back to one `translate` call per text, in order.
+        """
+        return [self.translate(text, target_language, source_language) for text in texts]
+
+    def batch_translate_multi(self, texts: List[str], target_languages: List[str], source_language: str = None) -> Dict[str, List[TranslationResult]]:
+        """Translate multiple texts into several languages.
+
+        Backends able to return several languages from one request should
+        override this; the default runs one batch_translate per language.
+        """
+        return {language: self.batch_translate(texts, language, source_language) for language in target_languages}
+
+    def stream_batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> Iterator[Tuple[int, TranslationResult]]:
+        """Translate multiple texts, yielding (index, result) pairs as each translation is finished.
+
+        Every index is yielded exactly once, not necessarily in order. Backends
+        able to stream replies should override this; the default yields the
+        results of batch_translate once it returns.
+        """
+        yield from enumerate(self.batch_translate(texts, target_language, source_language))
+
+    def set_max_concurrency(self, max_workers: int):
+        """Prepare for up to max_workers concurrent batch_translate calls."""
+        pass
+
+    def _send(self, request: Callable[[], T], texts: List[str]) -> T:
+        """Run one provider call under the provider's rate limiter and retry policy, recording its metrics."""
+        chars = sum(len(text) for text in texts)
+        tokens = sum(estimate_tokens(text) for text in texts)
+        start = time.perf_counter()
+        try:
+            result = call_with_retry(request, self.retry_policy, get_rate_limiter(self.provider), chars, tokens,
+                                     on_retry=lambda error: metrics.increment(self.provider, 'retries'))
+        except Exception:
+            metrics.record_request(self.provider, time.perf_counter() - start, chars, tokens, failed=True)
+            raise
+        metrics.record_request(self.provider, time.perf_counter() - start, chars, tokens)
+        return result
 
 
 class TranslatorFactory:
-    """Factory class for creating translator instances."""
+    """Factory class for creating translator instances.
+    
+    Translators can be registered as classes or as 'module:ClassName' paths,
+    which are only imported when first created. Third-party packages can add
+    translators through the 'auto_srt_translator.translators' entry point group.
+    """
     
-    _translators: Dict[str, Type[BaseTranslator]] = {}
+    ENTRY_POINT_GROUP = 'auto_srt_translator.translators'
+    
+    _translators: Dict[str, Union[Type[BaseTranslator], str]] = {}
+    _entry_points_loaded = False
     
     @classmethod
-    def register(cls, name: str, translator_class: Type[BaseTranslator]):
-        """Register a new translator implementation."""
+    def register(cls, name: str, translator_class: Union[Type[BaseTranslator], str]):
+        """Register a new translator implementation, or a 'module:ClassName' path to import lazily."""
         cls._translators[name] = translator_class
     
     @classmethod
-    def create(cls, name: str, **kwargs) -> BaseTranslator:
-        """Create a translator instance by name."""
+    def get(cls, name: str) -> Type[BaseTranslator]:
+        """Get a translator class by name, importing its module if needed."""
+        cls._load_entry_points()
         if name not in cls._translators:
             raise ValueError(f"Translator '{name}' not found. Available translators: {list(cls._translators.keys())}")
-        return cls._translators[name](**kwargs)
+        translator_class = cls._translators[name]
+        if isinstance(translator_class, str):
+            module_name, class_name = translator_class.split(':')
+            translator_class = getattr(importlib.import_module(module_name), class_name)
+            cls._translators[name] = translator_class
+        return translator_class
+    
+    @classmethod
+    def create(cls, name: str, **kwargs) -> BaseTranslator:
+        """Create a translator instance by name."""
+        return cls.get(name)(**kwargs)
     
     @classmethod
     def available_translators(cls) -> List[str]:
         """Get list of available translator names."""
-        return list(cls._translators.keys())
\ No newline at end of file
+        cls._load_entry_points()
+        return list(cls._translators.keys())
+    
+    @classmethod
+    def _load_entry_points(cls):
+        if cls._entry_points_loaded:
+            return
+        cls._entry_points_loaded = True
+        # importlib.metadata is slow to import; only pay for it when a translator is looked up
+        from importlib.metadata import entry_points
+        for entry_point in entry_points(group=cls.ENTRY_POINT_GROUP):
+            # Built-in and explicitly registered translators take precedence
+            cls._translators.setdefault(entry_point.name, entry_point.value)
@@ -0,0 +1,96 @@
+import re
+from typing import Callable, Iterable, Iterator, List, Tuple, TypeVar
+from .base import RequestLimits, estimate_tokens
+
+T = TypeVar('T')
+
+# Preferred places to split an over-long text, from most to least natural
+_SPLIT_PATTERNS = [
+    r'\n+',
+    r'(?<=[.!?;:。！？；：…])\s*',
+    r'[ \t]+',
+]
+
+
+def pack_batches(items: Iterable[T], limits: RequestLimits, text_of: Callable[[T], str] = str) -> Iterator[List[T]]:
+    """Greedily group items into batches that stay within the request limits.
+
+    An item that exceeds the limits on its own is yielded as a batch by
+    itself; use `split_text` to break such texts up first.
+    """
+    batch, chars, tokens = [], 0, 0
+    for item in items:
+        text = text_of(item)
+        item_chars, item_tokens = len(text), estimate_tokens(text)
+        if batch and not limits.fits(len(batch) + 1, chars + item_chars, tokens + item_tokens):
+            yield batch
+            batch, chars, tokens = [], 0, 0
+        batch.append(item)
+        chars += item_chars
+        tokens += item_tokens
+    if batch:
+        yield batch
+
+
+def split_text(text: str, limits: RequestLimits, level: int = 0) -> List[Tuple[str, str]]:
+    """Split a text into pieces that each fit in a single request.
+
+    Returns (piece, separator) pairs such that joining every piece with its
+    separator reproduces the text. Splits prefer line breaks, then sentence
+    ends, then spaces, and only cut inside a word as a last resort.
+    """
+    if _fits_alone(text, limits):
+        return [(text, '')]
+    if level == len(_SPLIT_PATTERNS):
+        return _hard_split(text, limits)
+
+    segments = []
+    position = 0
+    for match in re.finditer(_SPLIT_PATTERNS[level], text):
+        if match.start() > position:
+            segments.append((text[position:match.start()], match.group()))
+        elif segments:
+            segments[-1] = (segments[-1][0], segments[-1][1] + match.group())
+        position = match.end()
+    if position < len(text):
+        segments.append((text[position:], ''))
+
+    pieces = []
+    current, current_sep = '', ''
+    for segment, sep in segments:
+        if not _fits_alone(segment, limits):
+            if current:
+                pieces.append((current, current_sep))
+                current, current_sep = '', ''
+            sub_pieces = split_text(segment, limits, level + 1)
+            sub_pieces[-1] = (sub_pieces[-1][0], sep)
+            pieces.extend(sub_pieces)
+        elif current and not _fits_alone(current + current_sep + segment, limits):
+            pieces.append((current, current_sep))
+            current, current_sep = segment, sep
+        else:
+            current = current + current_sep + segment if current else segment
+            current_sep = sep
+    if current:
+        pieces.append((current, current_sep))
+    return pieces
+
+
+def _fits_alone(text: str, limits: RequestLimits) -> bool:
+    return limits.fits(1, len(text), estimate_tokens(text))
+
+
+def _hard_split(text: str, limits: RequestLimits) -> List[Tuple[str, str]]:
+    pieces = []
+    while text:
+        # Longest prefix that fits, found by binary search
+        low, high = 1, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if _fits_alone(text[:middle], limits):
+                low = middle
+            else:
+                high = middle - 1
+        pieces.append((text[:low], ''))
+        text = text[low:]
+    return pieces
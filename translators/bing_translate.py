@@ -1,20 +1,27 @@
-import requests
 from typing import List
-from .base import BaseTranslator, TranslationResult, TranslatorFactory
+from .base import BaseTranslator, RequestLimits, TranslationResult, TranslatorFactory
+from .http import SessionMixin
+from .ratelimit import is_request_wide
 
-class BingTranslator(BaseTranslator):
+class BingTranslator(SessionMixin, BaseTranslator):
     """Microsoft Azure Translator API implementation."""
     
-    def __init__(self, api_key: str, region: str = 'global'):
+    provider = 'bing'
+    
+    # Translator v3: up to 1000 array elements and 50,000 characters per request
+    request_limits = RequestLimits(max_items=1000, max_chars=50000)
+    
+    def __init__(self, api_key: str, region: str = 'global', pool_size: int = 10, timeout: float = 60, base_url: str = 'https://api.cognitive.microsofttranslator.com', compress_requests: bool = False):
         """Initialize with Azure Translator API key and region."""
         self.api_key = api_key
         self.region = region
-        self.base_url = 'https://api.cognitive.microsofttranslator.com'
+        self.base_url = base_url.rstrip('/')
         self.headers = {
             'Ocp-Apim-Subscription-Key': api_key,
             'Ocp-Apim-Subscription-Region': region,
             'Content-Type': 'application/json'
         }
+        self._init_session(self.headers, pool_size, timeout, compress_requests)
     
     def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
         try:
@@ -23,8 +30,7 @@ class BingTranslator(BaseTranslator):
                 url += f"&from={source_language}"
             
             body = [{'text': text}]
-            response = requests.post(url, headers=self.headers, json=body)
-            response.raise_for_status()
+            response = self._post(url, body, [text])
             
             result = response.json()[0]['translations'][0]
             detected_language = response.json()[0].get('detectedLanguage', {}).get('language', source_language)
@@ -42,7 +48,7 @@ class BingTranslator(BaseTranslator):
                 original_text=text,
                 translated_text=text,
                 target_language=target_language,
-                metadata={'error': str(e), 'provider': 'bing'}
+                metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'bing'}
             )
     
     def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
@@ -52,8 +58,7 @@ class BingTranslator(BaseTranslator):
                 url += f"&from={source_language}"
             
             body = [{'text': text} for text in texts]
-            response = requests.post(url, headers=self.headers, json=body)
-            response.raise_for_status()
+            response = self._post(url, body, texts)
             
             results = []
             for text, translation in zip(texts, response.json()):
@@ -75,7 +80,7 @@ class BingTranslator(BaseTranslator):
                     original_text=text,
                     translated_text=text,
                     target_language=target_language,
-                    metadata={'error': str(e), 'provider': 'bing'}
+                    metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'bing'}
                 )
                 for text in texts
             ]
@@ -0,0 +1,228 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterator, List, Optional, Tuple
+from .base import BaseTranslator, RequestLimits, TranslationResult
+from .metrics import metrics
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache lookups: NFC, trimmed lines, collapsed spaces."""
+    text = unicodedata.normalize('NFC', text)
+    lines = [re.sub(r'[ \t]+', ' ', line).strip() for line in text.splitlines()]
+    return '\n'.join(lines).strip()
+
+
+class TranslationCache:
+    """SQLite-backed translation memory with LRU size bound and optional TTL."""
+
+    def __init__(self, path: str, max_entries: int = 1000000, ttl: Optional[float] = None):
+        """Open (or create) a translation memory.
+
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of stored translations; least recently used are evicted
+            ttl: Maximum age of a translation in seconds (optional, no expiry by default)
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS translations ('
+            'key TEXT PRIMARY KEY, '
+            'translated_text TEXT NOT NULL, '
+            'source_language TEXT, '
+            'created_at REAL NOT NULL, '
+            'last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS translations_last_used ON translations (last_used)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS translations_created_at ON translations (created_at)')
+        self._conn.commit()
+        # Kept up to date by put_many, so the size bound never needs a full table scan
+        # (rows written by other processes sharing the file are counted on the next open)
+        self._count = self._conn.execute('SELECT COUNT(*) FROM translations').fetchone()[0]
+
+    @staticmethod
+    def make_key(provider: str, model: str, source_language: Optional[str], target_language: str, text: str) -> str:
+        """Build the cache key for a text under the given translation settings."""
+        raw = '\x1f'.join([provider, model or '', source_language or '', target_language, normalize_text(text)])
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, keys: List[str]) -> dict:
+        """Look up several keys at once, returning {key: (translated_text, source_language)} for hits."""
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        with self._lock:
+            unique_keys = list(dict.fromkeys(keys))
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT key, translated_text, source_language, created_at FROM translations "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for key, translated_text, source_language, created_at in rows:
+                    if self.ttl is not None and now - created_at > self.ttl:
+                        continue
+                    found[key] = (translated_text, source_language or '')
+            if found:
+                self._conn.executemany(
+                    'UPDATE translations SET last_used = ? WHERE key = ?',
+                    [(now, key) for key in found]
+                )
+                self._conn.commit()
+        return found
+
+    def put_many(self, items: List[Tuple[str, str, str]]):
+        """Store (key, translated_text, source_language) tuples and enforce the size bound."""
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            unique_keys = list(dict.fromkeys(key for key, _, _ in items))
+            existing = 0
+            for i in range(0, len(unique_keys), 500):
+                chunk = unique_keys[i:i + 500]
+                existing += self._conn.execute(
+                    f"SELECT COUNT(*) FROM translations WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchone()[0]
+            self._count += len(unique_keys) - existing
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO translations (key, translated_text, source_language, created_at, last_used) '
+                'VALUES (?, ?, ?, ?, ?)',
+                [(key, text, source_language, now, now) for key, text, source_language in items]
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        if self.ttl is not None:
+            self._count -= self._conn.execute('DELETE FROM translations WHERE created_at < ?', (now - self.ttl,)).rowcount
+        if self._count > self.max_entries:
+            self._count -= self._conn.execute(
+                'DELETE FROM translations WHERE key IN '
+                '(SELECT key FROM translations ORDER BY last_used ASC LIMIT ?)',
+                (self._count - self.max_entries,)
+            ).rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedTranslator(BaseTranslator):
+    """Wraps any translator so only cache misses are sent to the backend."""
+
+    def __init__(self, translator: BaseTranslator, cache: TranslationCache, provider: str):
+        """Initialize the caching wrapper.
+
+        Args:
+            translator: Backend translator to call on cache misses
+            cache: Translation memory to read from and write to
+            provider: Provider name used in cache keys
+        """
+        self.translator = translator
+        self.cache = cache
+        self.provider = provider
+        self.model = getattr(translator, 'model', '')
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def request_limits(self) -> RequestLimits:
+        return self.translator.request_limits
+
+    def set_max_concurrency(self, max_workers: int):
+        self.translator.set_max_concurrency(max_workers)
+
+    def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
+        return self.batch_translate([text], target_language, source_language)[0]
+
+    def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
+        return self.batch_translate_multi(texts, [target_language], source_language)[target_language]
+
+    def batch_translate_multi(self, texts: List[str], target_languages: List[str], source_language: str = None) -> Dict[str, List[TranslationResult]]:
+        results: Dict[str, List[Optional[TranslationResult]]] = {}
+        keys = {}
+        for language in target_languages:
+            keys[language], results[language] = self._lookup(texts, language, source_language)
+        missing = {i for language in target_languages for i, result in enumerate(results[language]) if result is None}
+
+        misses = sum(result is None for language in target_languages for result in results[language])
+        self._count(len(texts) * len(target_languages) - misses, misses)
+
+        if missing:
+            # Send every text some language is missing, in the languages missing anything
+            missing = sorted(missing)
+            languages = [language for language in target_languages if any(results[language][i] is None for i in missing)]
+            if len(languages) == 1:
+                translated = {languages[0]: self.translator.batch_translate([texts[i] for i in missing], languages[0], source_language)}
+            else:
+                translated = self.translator.batch_translate_multi([texts[i] for i in missing], languages, source_language)
+            to_store = []
+            for language in languages:
+                for i, result in zip(missing, translated[language]):
+                    if results[language][i] is not None:
+                        continue
+                    results[language][i] = result
+                    # Never remember failures, which carry the source text as their "translation"
+                    if not (result.metadata or {}).get('error'):
+                        to_store.append((keys[language][i], result.translated_text, result.source_language or ''))
+            self.cache.put_many(to_store)
+
+        return results
+
+    def stream_batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> Iterator[Tuple[int, TranslationResult]]:
+        keys, results = self._lookup(texts, target_language, source_language)
+        missing = [i for i, result in enumerate(results) if result is None]
+        self._count(len(texts) - len(missing), len(missing))
+        for i, result in enumerate(results):
+            if result is not None:
+                yield i, result
+
+        to_store = []
+        try:
+            for position, result in self.translator.stream_batch_translate([texts[i] for i in missing], target_language, source_language):
+                i = missing[position]
+                if not (result.metadata or {}).get('error'):
+                    to_store.append((keys[i], result.translated_text, result.source_language or ''))
+                yield i, result
+        finally:
+            # Keep what did arrive, even if the caller stops early
+            self.cache.put_many(to_store)
+
+    def _lookup(self, texts: List[str], language: str, source_language: Optional[str]) -> Tuple[List[str], List[Optional[TranslationResult]]]:
+        """Cache keys of texts, and their cached results (None for misses)."""
+        keys = [self.cache.make_key(self.provider, self.model, source_language, language, text) for text in texts]
+        found = self.cache.get_many(keys)
+        results = []
+        for text, key in zip(texts, keys):
+            if key in found:
+                translated_text, detected_language = found[key]
+                results.append(TranslationResult(
+                    original_text=text,
+                    translated_text=translated_text,
+                    source_language=detected_language or source_language or '',
+                    target_language=language,
+                    metadata={'provider': self.provider, 'cached': True}
+                ))
+            else:
+                results.append(None)
+        return keys, results
+
+    def _count(self, hits: int, misses: int):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+        metrics.increment(self.provider, 'cache_hits', hits)
+        metrics.increment(self.provider, 'cache_misses', misses)
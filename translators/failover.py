@@ -0,0 +1,264 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple, Union
+from .base import BaseTranslator, RequestLimits, TranslationResult, TranslatorFactory
+from .metrics import metrics
+from .ratelimit import is_request_wide
+
+
+class CircuitBreaker:
+    """Stops sending to a provider after repeated failures, then probes it again after a cool-down."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """Create a closed breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            reset_timeout: Seconds the breaker stays open before one trial request is let through
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            return 'half-open' if time.monotonic() - self.opened_at >= self.reset_timeout else 'open'
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now; in the half-open state only one trial at a time is."""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self.trial_running:
+                return False
+            self.trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.trial_running or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_running = False
+
+
+class FailoverTranslator(BaseTranslator):
+    """Sends each batch to an ordered list of providers, hedging slow requests and failing over on errors.
+
+    A batch goes to the first provider whose circuit breaker is closed. If it
+    has not answered within the hedge delay (a percentile of that provider's
+    recent latencies), the same batch is also sent to the next provider, and
+    whichever complete answer arrives first is used. Errors fail over to the
+    next provider straight away; cues every provider failed on keep the error
+    result of the first one. Each result's metadata names the provider that
+    served it, and `served` counts cues per provider.
+    """
+
+    provider = 'failover'
+
+    def __init__(self, providers: List[Union[BaseTranslator, Tuple[str, Dict]]], hedge_quantile: Optional[float] = 0.95, hedge_delay: float = 5.0, min_hedge_delay: float = 0.5, max_hedges: int = 1, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        """Initialize the composite translator.
+
+        Args:
+            providers: Translators in order of preference, as instances or (name, config) pairs
+                passed to TranslatorFactory.create
+            hedge_quantile: Latency quantile of a provider after which a batch is hedged
+                (None disables hedging)
+            hedge_delay: Hedge delay used until a provider has enough latency samples
+            min_hedge_delay: Lower bound of the hedge delay
+            max_hedges: Maximum number of extra providers a slow batch is sent to
+            failure_threshold: Consecutive failures that trip a provider's circuit breaker
+            reset_timeout: Seconds before a tripped provider is tried again
+        """
+        if not providers:
+            raise ValueError("FailoverTranslator needs at least one provider")
+        self.translators = [
+            provider if isinstance(provider, BaseTranslator) else TranslatorFactory.create(provider[0], **provider[1])
+            for provider in providers
+        ]
+        self.names = [translator.provider or type(translator).__name__ for translator in self.translators]
+        self.breakers = [CircuitBreaker(failure_threshold, reset_timeout) for _ in self.translators]
+        self.hedge_quantile = hedge_quantile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self.max_hedges = max_hedges
+        self.model = '+'.join(f"{name}:{getattr(translator, 'model', '')}" for name, translator in zip(self.names, self.translators))
+
+        self.served: Dict[str, int] = {name: 0 for name in self.names}
+        self.hedged = 0
+        self.failovers = 0
+        self._latencies = [deque(maxlen=200) for _ in self.translators]
+        self._lock = threading.Lock()
+        self._pool_size = 2 * len(self.translators)
+        self._executor = ThreadPoolExecutor(max_workers=self._pool_size)
+
+    @property
+    def request_limits(self) -> RequestLimits:
+        # Every provider may receive any batch, so batches must fit the strictest one
+        limits = [translator.request_limits for translator in self.translators]
+
+        def strictest(values):
+            values = [value for value in values if value is not None]
+            return min(values) if values else None
+        return RequestLimits(
+            max_items=strictest(limit.max_items for limit in limits),
+            max_chars=strictest(limit.max_chars for limit in limits),
+            max_tokens=strictest(limit.max_tokens for limit in limits),
+        )
+
+    def set_max_concurrency(self, max_workers: int):
+        for translator in self.translators:
+            translator.set_max_concurrency(max_workers)
+        # Room for every batch in flight plus its hedges and failovers. Runs may share this
+        # translator, so the pool only ever grows; the old one is left to batches still
+        # submitting to it and its idle threads exit once it is garbage collected.
+        pool_size = max_workers * (self.max_hedges + 1) + len(self.translators)
+        with self._lock:
+            if pool_size > self._pool_size:
+                self._pool_size = pool_size
+                self._executor = ThreadPoolExecutor(max_workers=pool_size)
+
+    def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
+        return self.batch_translate([text], target_language, source_language)[0]
+
+    def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
+        return self.batch_translate_multi(texts, [target_language], source_language)[target_language]
+
+    def batch_translate_multi(self, texts: List[str], target_languages: List[str], source_language: str = None) -> Dict[str, List[TranslationResult]]:
+        order = [i for i, breaker in enumerate(self.breakers) if breaker.state != 'open']
+        if not order:
+            # Every breaker is open: better to try the preferred provider than to fail outright
+            order = [0]
+
+        running: Dict[Future, int] = {}
+        finished: List[Tuple[int, Dict[str, List[TranslationResult]]]] = []
+        hedges = 0
+        hedge_at = float('inf')
+        while True:
+            # Fail over when nothing is in flight; hedge when the newest request is too slow
+            hedge_due = running and hedges < self.max_hedges and time.monotonic() >= hedge_at
+            if order and (not running or hedge_due):
+                index = order.pop(0)
+                if not self.breakers[index].allow() and (running or order or finished):
+                    # Another batch is already probing this half-open provider
+                    continue
+                if running:
+                    hedges += 1
+                    with self._lock:
+                        self.hedged += 1
+                    metrics.increment(self.names[index], 'hedged_requests')
+                elif finished:
+                    with self._lock:
+                        self.failovers += 1
+                    metrics.increment(self.names[index], 'failovers')
+                running[self._executor.submit(self._attempt, index, texts, target_languages, source_language)] = index
+                hedge_at = time.monotonic() + self._hedge_delay(index)
+            if not running:
+                break
+
+            timeout = None
+            if order and hedges < self.max_hedges and hedge_at != float('inf'):
+                timeout = max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = running.pop(future)
+                results = future.result()
+                if not any(self._failed(results)):
+                    # Late answers from the other providers are simply dropped
+                    return self._serve(index, results)
+                finished.append((index, results))
+
+        return self._merge(finished, len(texts), target_languages)
+
+    def _hedge_delay(self, index: int) -> float:
+        """How long to wait for the given provider before hedging."""
+        if self.hedge_quantile is None:
+            return float('inf')
+        with self._lock:
+            latencies = sorted(self._latencies[index])
+        if len(latencies) < 20:
+            return self.hedge_delay
+        return max(self.min_hedge_delay, latencies[min(len(latencies) - 1, int(self.hedge_quantile * len(latencies)))])
+
+    def _attempt(self, index: int, texts: List[str], target_languages: List[str], source_language: Optional[str]) -> Dict[str, List[TranslationResult]]:
+        """Send a batch to one provider, converting exceptions into error results and updating its breaker."""
+        translator = self.translators[index]
+        start = time.monotonic()
+        try:
+            if len(target_languages) == 1:
+                results = {target_languages[0]: translator.batch_translate(texts, target_languages[0], source_language)}
+            else:
+                results = translator.batch_translate_multi(texts, target_languages, source_language)
+        except Exception as e:
+            print(f"{self.names[index]} failover error: {e}")
+            results = {
+                language: [
+                    TranslationResult(
+                        original_text=text,
+                        translated_text=text,
+                        target_language=language,
+                        metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': self.names[index]}
+                    )
+                    for text in texts
+                ]
+                for language in target_languages
+            }
+
+        failed = self._failed(results)
+        if failed and all(failed):
+            self.breakers[index].record_failure()
+        else:
+            self.breakers[index].record_success()
+            if not any(failed):
+                with self._lock:
+                    self._latencies[index].append(time.monotonic() - start)
+        return results
+
+    @staticmethod
+    def _failed(results: Dict[str, List[TranslationResult]]) -> List[bool]:
+        return [bool((result.metadata or {}).get('error')) for language_results in results.values() for result in language_results]
+
+    def _serve(self, index: int, results: Dict[str, List[TranslationResult]]) -> Dict[str, List[TranslationResult]]:
+        for language_results in results.values():
+            for result in language_results:
+                result.metadata = dict(result.metadata or {}, provider=self.names[index])
+        with self._lock:
+            self.served[self.names[index]] += sum(len(language_results) for language_results in results.values())
+        return results
+
+    def _merge(self, finished: List[Tuple[int, Dict[str, List[TranslationResult]]]], count: int, target_languages: List[str]) -> Dict[str, List[TranslationResult]]:
+        """Combine partial answers cue by cue, preferring the earliest provider in the list."""
+        finished = sorted(finished, key=lambda item: item[0])
+        merged = {}
+        for language in target_languages:
+            merged[language] = []
+            for i in range(count):
+                candidates = [(index, results[language][i]) for index, results in finished]
+                index, result = next(
+                    ((index, result) for index, result in candidates if not (result.metadata or {}).get('error')),
+                    candidates[0]
+                )
+                if not (result.metadata or {}).get('error'):
+                    result.metadata = dict(result.metadata or {}, provider=self.names[index])
+                    with self._lock:
+                        self.served[self.names[index]] += 1
+                merged[language].append(result)
+        return merged
+
+
+# Register the translator
+TranslatorFactory.register('failover', FailoverTranslator)
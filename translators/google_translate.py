@@ -1,21 +1,28 @@
 from typing import List
 from google.cloud import translate_v2 as translate
-from .base import BaseTranslator, TranslationResult, TranslatorFactory
+from .base import BaseTranslator, RequestLimits, TranslationResult, TranslatorFactory
+from .ratelimit import is_request_wide
 
 class GoogleTranslator(BaseTranslator):
     """Google Cloud Translation API implementation."""
     
-    def __init__(self, api_key: str = None):
+    provider = 'google'
+    
+    # Translation v2: up to 128 segments and 30,000 characters per request
+    request_limits = RequestLimits(max_items=128, max_chars=30000)
+    
+    def __init__(self, api_key: str = None, base_url: str = None):
         """Initialize with Google Cloud API key."""
-        self.client = translate.Client(api_key)
+        client_options = {'api_endpoint': base_url} if base_url else None
+        self.client = translate.Client(api_key, client_options=client_options)
     
     def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
         try:
-            result = self.client.translate(
+            result = self._send(lambda: self.client.translate(
                 text,
                 target_language=target_language,
                 source_language=source_language
-            )
+            ), [text])
             return TranslationResult(
                 original_text=text,
                 translated_text=result['translatedText'],
@@ -30,17 +37,17 @@ class GoogleTranslator(BaseTranslator):
                 original_text=text,
                 translated_text=text,
                 target_language=target_language,
-                metadata={'error': str(e), 'provider': 'google'}
+                metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'google'}
             )
     
     def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
         # Google Translate API supports batch translation natively
         try:
-            results = self.client.translate(
+            results = self._send(lambda: self.client.translate(
                 texts,
                 target_language=target_language,
                 source_language=source_language
-            )
+            ), texts)
             return [
                 TranslationResult(
                     original_text=text,
@@ -59,7 +66,7 @@ class GoogleTranslator(BaseTranslator):
                     original_text=text,
                     translated_text=text,
                     target_language=target_language,
-                    metadata={'error': str(e), 'provider': 'google'}
+                    metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'google'}
                 )
                 for text in texts
             ]
@@ -0,0 +1,97 @@
+import contextlib
+import gzip
+import json
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Request bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+
+def create_session(headers: Dict[str, str], pool_size: int = 10) -> requests.Session:
+    """Create a keep-alive session with a connection pool of the given size."""
+    session = requests.Session()
+    session.headers.update(headers)
+    mount_pool(session, pool_size)
+    return session
+
+
+def mount_pool(session: requests.Session, pool_size: int):
+    """(Re)mount a connection pool able to hold pool_size concurrent connections.
+
+    The connections of a previously mounted pool are closed once they are released.
+    """
+    old_adapters = {session.adapters.get(prefix) for prefix in ('https://', 'http://')}
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    for old_adapter in old_adapters:
+        if old_adapter is not None:
+            old_adapter.close()
+
+
+class SessionMixin:
+    """Gives a REST translator a pooled, reusable HTTP session."""
+
+    def _init_session(self, headers: Dict[str, str], pool_size: int, timeout: float, compress_requests: bool = False):
+        """Set up the session.
+
+        Args:
+            headers: Headers sent with every request
+            pool_size: Connections kept open for reuse (grown by set_max_concurrency)
+            timeout: Seconds to wait for a response
+            compress_requests: Gzip request bodies of COMPRESS_MIN_BYTES or more, for
+                providers that accept 'Content-Encoding: gzip' (responses are always
+                accepted compressed)
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.compress_requests = compress_requests
+        self.session = create_session(headers, pool_size)
+
+    def set_max_concurrency(self, max_workers: int):
+        # Grow the pool so concurrent batches never wait for (or discard) a connection
+        if max_workers > self.pool_size:
+            self.pool_size = max_workers
+            mount_pool(self.session, max_workers)
+
+    def _post(self, url: str, body: Any, texts: List[str]) -> requests.Response:
+        """POST a JSON body through the pooled session, with rate limiting and retries."""
+        data, headers = self._encode_body(body)
+        def request():
+            response = self.session.post(url, data=data, headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            return response
+        return self._send(request, texts)
+
+    def _post_stream(self, url: str, body: Any, texts: List[str]) -> Iterator[str]:
+        """POST a JSON body and yield the data of each server-sent event in the reply.
+
+        Rate limiting and retries cover the request up to the response headers;
+        the stream ends at a '[DONE]' event or when the server closes it.
+        """
+        data, headers = self._encode_body(body)
+        def request():
+            response = self.session.post(url, data=data, headers=headers, timeout=self.timeout, stream=True)
+            response.raise_for_status()
+            return response
+        with contextlib.closing(self._send(request, texts)) as response:
+            for line in response.iter_lines():
+                # Decode explicitly: event streams rarely declare a charset
+                line = line.decode('utf-8') if isinstance(line, bytes) else line
+                if not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    return
+                yield data
+
+    def _encode_body(self, body: Any) -> Tuple[bytes, Dict[str, str]]:
+        """Serialize a JSON body, gzipping it if enabled and large enough; returns it with its extra headers."""
+        data = json.dumps(body).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.compress_requests and len(data) >= COMPRESS_MIN_BYTES:
+            data = gzip.compress(data)
+            headers['Content-Encoding'] = 'gzip'
+        return data, headers
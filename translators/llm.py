@@ -0,0 +1,328 @@
+import json
+import re
+from abc import abstractmethod
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .base import BaseTranslator, RequestLimits, TranslationResult
+from .ratelimit import is_request_wide
+
+
+class LLMTranslator(BaseTranslator):
+    """Base class for chat-model translators.
+
+    Subclasses implement `_complete`; this class provides single-text
+    translation and, when `merge` is enabled, packs a whole batch of texts
+    into one JSON-structured prompt. Subclasses able to stream replies also
+    implement `_complete_stream`, which lets `stream_batch_translate` hand
+    out each cue as soon as the model has finished it.
+    """
+
+    provider = ''
+    model = ''
+    merge = True
+    # Keeps merged prompts, and their replies, well inside the model's output window
+    request_limits = RequestLimits(max_items=100, max_tokens=2000)
+
+    @abstractmethod
+    def _complete(self, system_prompt: str, user_prompt: str) -> str:
+        """Send one prompt to the model and return its reply text."""
+        pass
+
+    def _complete_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        """Send one prompt to the model and yield its reply text as it arrives.
+
+        The default yields the whole reply of `_complete` at once.
+        """
+        yield self._complete(system_prompt, user_prompt)
+
+    def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
+        try:
+            system_prompt = f"You are a translator. Translate the following text to {target_language}. Provide only the translation, no explanations."
+            translated_text = self._complete(system_prompt, text).strip()
+            return TranslationResult(
+                original_text=text,
+                translated_text=translated_text,
+                target_language=target_language,
+                metadata={'provider': self.provider, 'model': self.model}
+            )
+        except Exception as e:
+            print(f"{self.provider} translation error: {e}")
+            return TranslationResult(
+                original_text=text,
+                translated_text=text,
+                target_language=target_language,
+                metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': self.provider}
+            )
+
+    def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
+        if not self.merge or len(texts) <= 1:
+            return super().batch_translate(texts, target_language, source_language)
+
+        try:
+            translations = self._merged_request(texts, target_language, source_language)
+        except Exception as e:
+            print(f"{self.provider} merged translation error: {e}")
+            return [
+                TranslationResult(
+                    original_text=text,
+                    translated_text=text,
+                    target_language=target_language,
+                    metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': self.provider}
+                )
+                for text in texts
+            ]
+
+        if translations is None:
+            # The model dropped, merged or renumbered cues: retry each half separately
+            middle = len(texts) // 2
+            return (self.batch_translate(texts[:middle], target_language, source_language)
+                    + self.batch_translate(texts[middle:], target_language, source_language))
+
+        return [
+            TranslationResult(
+                original_text=text,
+                translated_text=translated_text,
+                source_language=source_language or '',
+                target_language=target_language,
+                metadata={'provider': self.provider, 'model': self.model, 'merged': True}
+            )
+            for text, translated_text in zip(texts, translations)
+        ]
+
+    def batch_translate_multi(self, texts: List[str], target_languages: List[str], source_language: str = None) -> Dict[str, List[TranslationResult]]:
+        if not self.merge or len(target_languages) <= 1:
+            return super().batch_translate_multi(texts, target_languages, source_language)
+
+        try:
+            translations = self._merged_multi_request(texts, target_languages, source_language)
+        except Exception as e:
+            print(f"{self.provider} merged translation error: {e}")
+            translations = None
+
+        if translations is None:
+            # Fall back to one merged request per language, which splits further if needed
+            return super().batch_translate_multi(texts, target_languages, source_language)
+
+        return {
+            language: [
+                TranslationResult(
+                    original_text=text,
+                    translated_text=item[language],
+                    source_language=source_language or '',
+                    target_language=language,
+                    metadata={'provider': self.provider, 'model': self.model, 'merged': True}
+                )
+                for text, item in zip(texts, translations)
+            ]
+            for language in target_languages
+        }
+
+    def stream_batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> Iterator[Tuple[int, TranslationResult]]:
+        if not self.merge or len(texts) <= 1:
+            yield from super().stream_batch_translate(texts, target_language, source_language)
+            return
+
+        finished = set()
+        try:
+            system_prompt, user_prompt = self._merged_prompts(texts, target_language, source_language)
+            for item in iter_merged_items(self._complete_stream(system_prompt, user_prompt), ['text']):
+                position = item['id'] - 1
+                if 0 <= position < len(texts) and position not in finished:
+                    finished.add(position)
+                    yield position, TranslationResult(
+                        original_text=texts[position],
+                        translated_text=item['text'],
+                        source_language=source_language or '',
+                        target_language=target_language,
+                        metadata={'provider': self.provider, 'model': self.model, 'merged': True, 'streamed': True}
+                    )
+        except Exception as e:
+            print(f"{self.provider} streamed translation error: {e}")
+            for position, text in enumerate(texts):
+                if position not in finished:
+                    yield position, TranslationResult(
+                        original_text=text,
+                        translated_text=text,
+                        target_language=target_language,
+                        metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': self.provider}
+                    )
+            return
+
+        # The model dropped or garbled some cues: translate those again without streaming
+        missing = [position for position in range(len(texts)) if position not in finished]
+        if missing:
+            results = self.batch_translate([texts[position] for position in missing], target_language, source_language)
+            yield from zip(missing, results)
+
+    def _merged_prompts(self, texts: List[str], target_language: str, source_language: str = None) -> Tuple[str, str]:
+        """Build the system and user prompts translating texts in one request."""
+        source = f" from {source_language}" if source_language else ''
+        system_prompt = (
+            f"You are a subtitle translator. Translate each subtitle{source} to {target_language}. "
+            "The input is a JSON array of objects with an \"id\" and a \"text\". "
+            "Reply with only a JSON array containing exactly one object per input object, "
+            "with the same \"id\" and the translation in \"text\". "
+            "Never merge, split or omit subtitles, and keep line breaks inside a subtitle as \\n."
+        )
+        user_prompt = json.dumps([{'id': i, 'text': text} for i, text in enumerate(texts, 1)], ensure_ascii=False)
+        return system_prompt, user_prompt
+
+    def _merged_request(self, texts: List[str], target_language: str, source_language: str = None) -> Optional[List[str]]:
+        """Translate texts in one request; returns None if the reply does not match the input cue for cue."""
+        system_prompt, user_prompt = self._merged_prompts(texts, target_language, source_language)
+        return parse_merged_reply(self._complete(system_prompt, user_prompt), len(texts))
+
+    def _merged_multi_request(self, texts: List[str], target_languages: List[str], source_language: str = None) -> Optional[List[Dict[str, str]]]:
+        """Translate texts into several languages in one request; returns None on a mismatched reply."""
+        source = f" from {source_language}" if source_language else ''
+        languages = ', '.join(f'"{language}"' for language in target_languages)
+        system_prompt = (
+            f"You are a subtitle translator. Translate each subtitle{source} into each of these languages: {languages}. "
+            "The input is a JSON array of objects with an \"id\" and a \"text\". "
+            "Reply with only a JSON array containing exactly one object per input object, "
+            f"with the same \"id\" and one field per language code ({languages}) holding the translation. "
+            "Never merge, split or omit subtitles, and keep line breaks inside a subtitle as \\n."
+        )
+        user_prompt = json.dumps([{'id': i, 'text': text} for i, text in enumerate(texts, 1)], ensure_ascii=False)
+        return parse_merged_items(self._complete(system_prompt, user_prompt), len(texts), target_languages)
+
+
+class ChatCompletionsTranslator(LLMTranslator):
+    """Base class for translators speaking the OpenAI-compatible /chat/completions API.
+
+    Combine with `SessionMixin` for the pooled session behind `_post` and
+    `_post_stream`; subclasses set `provider` and their default model and URL.
+    """
+
+    def __init__(self, api_key: str, model: str, merge: bool = True, pool_size: int = 10, timeout: float = 60, base_url: str = '', compress_requests: bool = False):
+        self.api_key = api_key
+        self.model = model
+        self.merge = merge
+        self.base_url = base_url.rstrip('/')
+        self.headers = {
+            'Authorization': f'Bearer {api_key}',
+            'Content-Type': 'application/json'
+        }
+        self._init_session(self.headers, pool_size, timeout, compress_requests)
+
+    def _chat_body(self, system_prompt: str, user_prompt: str) -> Dict:
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            'temperature': 0.3
+        }
+
+    def _complete(self, system_prompt: str, user_prompt: str) -> str:
+        response = self._post(
+            f"{self.base_url}/chat/completions",
+            self._chat_body(system_prompt, user_prompt),
+            [system_prompt, user_prompt]
+        )
+        return response.json()['choices'][0]['message']['content']
+
+    def _complete_stream(self, system_prompt: str, user_prompt: str) -> Iterator[str]:
+        events = self._post_stream(
+            f"{self.base_url}/chat/completions",
+            dict(self._chat_body(system_prompt, user_prompt), stream=True),
+            [system_prompt, user_prompt]
+        )
+        for event in events:
+            choices = json.loads(event).get('choices') or [{}]
+            content = choices[0].get('delta', {}).get('content')
+            if content:
+                yield content
+
+
+def parse_merged_reply(reply: str, expected: int) -> Optional[List[str]]:
+    """Parse a merged JSON reply into translations ordered by id.
+
+    Returns None unless the reply contains exactly the ids 1..expected.
+    """
+    items = parse_merged_items(reply, expected, ['text'])
+    return [item['text'] for item in items] if items is not None else None
+
+
+def parse_merged_items(reply: str, expected: int, fields: List[str]) -> Optional[List[Dict[str, str]]]:
+    """Parse a merged JSON reply into {field: translation} dicts ordered by id.
+
+    Returns None unless the reply contains exactly the ids 1..expected and
+    every object has a string value for each field.
+    """
+    # Models often wrap JSON in a markdown code fence or add a sentence around it
+    reply = re.sub(r'^```(?:json)?\s*|\s*```$', '', reply.strip())
+    start, end = reply.find('['), reply.rfind(']')
+    if start == -1 or end < start:
+        return None
+    try:
+        items = json.loads(reply[start:end + 1])
+    except ValueError:
+        return None
+
+    parsed = {}
+    for item in items if isinstance(items, list) else []:
+        item = _parse_item(item, fields)
+        if item is None:
+            return None
+        parsed[item.pop('id')] = item
+
+    if sorted(parsed) != list(range(1, expected + 1)):
+        return None
+    return [parsed[i] for i in range(1, expected + 1)]
+
+
+def iter_merged_items(chunks: Iterable[str], fields: List[str]) -> Iterator[Dict]:
+    """Incrementally parse a merged JSON reply arriving in chunks.
+
+    Yields each object of the reply's array, as {'id': int, field: translation},
+    as soon as its closing brace arrives; malformed objects are skipped, so
+    callers must check which ids are missing once the reply ends.
+    """
+    depth = 0
+    in_string = escaped = False
+    current: List[str] = []
+    for chunk in chunks:
+        for char in chunk:
+            if depth == 0:
+                # Skip anything (such as a markdown code fence) before the array
+                if char == '[':
+                    depth = 1
+                continue
+            if depth >= 2:
+                current.append(char)
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == '\\':
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in '{[':
+                depth += 1
+                if depth == 2:
+                    current = [char]
+            elif char in '}]':
+                depth -= 1
+                if depth == 1:
+                    try:
+                        item = _parse_item(json.loads(''.join(current)), fields)
+                    except ValueError:
+                        item = None
+                    if item is not None:
+                        yield item
+                elif depth == 0:
+                    return
+
+
+def _parse_item(item, fields: List[str]) -> Optional[Dict]:
+    """Validate one reply object; returns {'id': int, field: stripped text} or None."""
+    if not isinstance(item, dict) or not all(isinstance(item.get(field), str) for field in fields):
+        return None
+    try:
+        item_id = int(item.get('id'))
+    except (TypeError, ValueError):
+        return None
+    return dict({field: item[field].strip() for field in fields}, id=item_id)
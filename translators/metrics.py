@@ -0,0 +1,197 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional
+
+# Upper bounds (seconds) of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf'))
+
+# Rough list prices in USD, used only for cost estimates; override with set_price
+PRICES: Dict[str, Dict[str, float]] = {
+    'google': {'per_million_chars': 20.0},
+    'bing': {'per_million_chars': 10.0},
+    'yandex': {'per_million_chars': 15.0},
+    'openai': {'per_million_input_tokens': 0.5, 'per_million_output_tokens': 1.5},
+    'deepseek': {'per_million_input_tokens': 0.27, 'per_million_output_tokens': 1.1},
+    'gemini': {'per_million_input_tokens': 0.1, 'per_million_output_tokens': 0.4},
+}
+
+COUNTERS = (
+    'requests', 'request_failures', 'retries',
+    'chars_in', 'tokens_in', 'chars_out', 'tokens_out',
+    'failed_texts', 'cache_hits', 'cache_misses',
+    'hedged_requests', 'failovers', 'redriven_requests',
+)
+
+
+def set_price(provider: str, per_million_chars: float = None, per_million_input_tokens: float = None, per_million_output_tokens: float = None):
+    """Set the prices used to estimate the cost of a provider's traffic."""
+    PRICES[provider] = {
+        key: value
+        for key, value in (
+            ('per_million_chars', per_million_chars),
+            ('per_million_input_tokens', per_million_input_tokens),
+            ('per_million_output_tokens', per_million_output_tokens),
+        )
+        if value is not None
+    }
+
+
+class MetricsRegistry:
+    """Thread-safe per-provider counters and latency histograms for translation runs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: Dict[str, Dict[str, float]] = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+            self.latency_buckets: Dict[str, list] = defaultdict(lambda: [0] * len(LATENCY_BUCKETS))
+            self.latency_sum: Dict[str, float] = defaultdict(float)
+            self.latency_max: Dict[str, float] = defaultdict(float)
+            self.runs = {'runs': 0, 'cues': 0, 'seconds': 0.0}
+
+    def increment(self, provider: str, counter: str, amount: float = 1):
+        with self._lock:
+            self.counters[provider][counter] += amount
+
+    def record_request(self, provider: str, seconds: float, chars: int, tokens: int, failed: bool = False):
+        """Record one provider call (including any retries it needed)."""
+        with self._lock:
+            counters = self.counters[provider]
+            counters['requests'] += 1
+            counters['chars_in'] += chars
+            counters['tokens_in'] += tokens
+            if failed:
+                counters['request_failures'] += 1
+            buckets = self.latency_buckets[provider]
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+                    break
+            self.latency_sum[provider] += seconds
+            self.latency_max[provider] = max(self.latency_max[provider], seconds)
+
+    def record_output(self, provider: str, chars: int, tokens: int):
+        with self._lock:
+            self.counters[provider]['chars_out'] += chars
+            self.counters[provider]['tokens_out'] += tokens
+
+    def record_run(self, seconds: float, cues: int):
+        with self._lock:
+            self.runs['runs'] += 1
+            self.runs['cues'] += cues
+            self.runs['seconds'] += seconds
+
+    def estimated_cost(self, provider: str) -> float:
+        counters = self.counters[provider]
+        prices = PRICES.get(provider, {})
+        return (counters['chars_in'] * prices.get('per_million_chars', 0.0)
+                + counters['tokens_in'] * prices.get('per_million_input_tokens', 0.0)
+                + counters['tokens_out'] * prices.get('per_million_output_tokens', 0.0)) / 1e6
+
+    def _latency_quantile(self, provider: str, quantile: float) -> Optional[float]:
+        """Upper bound of the histogram bucket holding the given quantile."""
+        buckets = self.latency_buckets[provider]
+        total = sum(buckets)
+        if not total:
+            return None
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, buckets):
+            seen += count
+            if seen >= quantile * total:
+                return bound if bound != float('inf') else self.latency_max[provider]
+        return self.latency_max[provider]
+
+    def summary(self) -> Dict:
+        """All metrics as a JSON-serializable dictionary."""
+        with self._lock:
+            providers = {}
+            for provider, counters in self.counters.items():
+                requests = sum(self.latency_buckets[provider])
+                providers[provider] = dict(
+                    counters,
+                    latency_seconds={
+                        'count': requests,
+                        'mean': self.latency_sum[provider] / requests if requests else None,
+                        'p50': self._latency_quantile(provider, 0.5),
+                        'p99': self._latency_quantile(provider, 0.99),
+                        'max': self.latency_max[provider] if requests else None,
+                    },
+                    estimated_cost_usd=round(self.estimated_cost(provider), 6),
+                )
+            return {'runs': dict(self.runs), 'providers': providers}
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += [
+                '# TYPE srt_translator_runs_total counter',
+                f"srt_translator_runs_total {self.runs['runs']}",
+                '# TYPE srt_translator_cues_total counter',
+                f"srt_translator_cues_total {self.runs['cues']}",
+                '# TYPE srt_translator_run_seconds_total counter',
+                f"srt_translator_run_seconds_total {self.runs['seconds']}",
+            ]
+            for counter in COUNTERS:
+                lines.append(f'# TYPE srt_translator_{counter}_total counter')
+                for provider, counters in sorted(self.counters.items()):
+                    lines.append(f'srt_translator_{counter}_total{{provider="{provider}"}} {counters[counter]}')
+
+            lines.append('# TYPE srt_translator_estimated_cost_usd gauge')
+            for provider in sorted(self.counters):
+                lines.append(f'srt_translator_estimated_cost_usd{{provider="{provider}"}} {self.estimated_cost(provider):.6f}')
+
+            lines.append('# TYPE srt_translator_request_latency_seconds histogram')
+            for provider, buckets in sorted(self.latency_buckets.items()):
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, buckets):
+                    cumulative += count
+                    le = '+Inf' if bound == float('inf') else bound
+                    lines.append(f'srt_translator_request_latency_seconds_bucket{{provider="{provider}",le="{le}"}} {cumulative}')
+                lines.append(f'srt_translator_request_latency_seconds_sum{{provider="{provider}"}} {self.latency_sum[provider]}')
+                lines.append(f'srt_translator_request_latency_seconds_count{{provider="{provider}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str):
+        """Write the JSON summary to path."""
+        _write_atomically(path, json.dumps(self.summary(), indent=2))
+
+    def write_prometheus(self, path: str):
+        """Write the Prometheus text format to path (e.g. for node_exporter's textfile collector)."""
+        _write_atomically(path, self.to_prometheus())
+
+    def serve_prometheus(self, port: int, host: str = '127.0.0.1'):
+        """Serve the Prometheus text format at http://host:port/metrics from a background thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                data = registry.to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def _write_atomically(path: str, content: str):
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+# Process-wide registry every translator reports to
+metrics = MetricsRegistry()
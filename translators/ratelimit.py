@@ -0,0 +1,169 @@
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, TypeVar
+
+T = TypeVar('T')
+
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve units and sleep off any deficit."""
+
+    def __init__(self, rate: float, capacity: float):
+        """Create a bucket refilled at `rate` units per second, holding at most `capacity`."""
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        """Take amount units from the bucket and return how long to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Requests larger than the bucket go into deficit and wait it off like any other
+            self.tokens -= amount
+            return max(0.0, -self.tokens / self.rate)
+
+
+class RateLimiter:
+    """Client-side quota shared by every translator instance of one provider."""
+
+    def __init__(self, requests_per_second: float = None, chars_per_minute: float = None, tokens_per_minute: float = None):
+        """Create a limiter; any limit left as None is not enforced.
+
+        Args:
+            requests_per_second: Maximum request rate
+            chars_per_minute: Maximum characters sent per minute
+            tokens_per_minute: Maximum estimated model tokens sent per minute
+        """
+        self.requests = TokenBucket(requests_per_second, max(1, requests_per_second)) if requests_per_second else None
+        self.chars = TokenBucket(chars_per_minute / 60, chars_per_minute) if chars_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute / 60, tokens_per_minute) if tokens_per_minute else None
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, chars: int = 0, tokens: int = 0):
+        """Block until a request of the given size may be sent."""
+        waits = [self.paused_until - time.monotonic()]
+        if self.requests:
+            waits.append(self.requests.reserve(1))
+        if self.chars and chars:
+            waits.append(self.chars.reserve(chars))
+        if self.tokens and tokens:
+            waits.append(self.tokens.reserve(tokens))
+        wait = max(waits)
+        if wait > 0:
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold back every caller for the given number of seconds (e.g. after a 429)."""
+        with self._lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+_rate_limiters: Dict[str, RateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """Get the shared rate limiter of a provider, creating an unlimited one if needed."""
+    with _rate_limiters_lock:
+        if provider not in _rate_limiters:
+            _rate_limiters[provider] = RateLimiter()
+        return _rate_limiters[provider]
+
+
+def configure_rate_limit(provider: str, requests_per_second: float = None, chars_per_minute: float = None, tokens_per_minute: float = None):
+    """Set the client-side quota used by all translators of a provider."""
+    with _rate_limiters_lock:
+        _rate_limiters[provider] = RateLimiter(requests_per_second, chars_per_minute, tokens_per_minute)
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings for transient provider errors."""
+    max_retries: int = 5
+    base_delay: float = 1.0
+    max_delay: float = 60.0
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given (0-based) retry attempt."""
+        delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(delay / 2, delay)
+
+
+def status_code(error: Exception) -> Optional[int]:
+    """Extract an HTTP status code from requests or SDK exceptions, if present."""
+    response = getattr(error, 'response', None)
+    for candidate in (getattr(response, 'status_code', None), getattr(error, 'status_code', None), getattr(error, 'code', None)):
+        if isinstance(candidate, int):
+            return candidate
+    return None
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Read a Retry-After header (seconds or HTTP date) from a failed response."""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or {}
+    value = headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Whether an error is worth retrying: throttling, server errors and network failures."""
+    code = status_code(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, TimeoutError)) or type(error).__name__ in ('ConnectionError', 'Timeout', 'ReadTimeout', 'ConnectTimeout')
+
+
+def is_request_wide(error: Exception) -> bool:
+    """Whether an error concerns the request as a whole rather than any text in it.
+
+    Authentication and permission errors, throttling, server errors and network
+    failures would fail any request alike; other errors (a 400, a content filter)
+    may be down to particular texts.
+    """
+    return status_code(error) in (401, 403) or is_retryable(error)
+
+
+def call_with_retry(request: Callable[[], T], policy: RetryPolicy, limiter: RateLimiter, chars: int = 0, tokens: int = 0, on_retry: Callable[[Exception], None] = None) -> T:
+    """Send a request under the rate limiter, retrying transient failures.
+
+    The last error is re-raised once retries are exhausted or when the error
+    is not retryable.
+    """
+    attempt = 0
+    while True:
+        limiter.acquire(chars, tokens)
+        try:
+            return request()
+        except Exception as e:
+            if attempt >= policy.max_retries or not is_retryable(e):
+                raise
+            delay = retry_after(e)
+            if delay is not None:
+                # The server told us when to come back; make every worker wait, not just this one
+                limiter.pause(delay)
+                delay += random.uniform(0, policy.base_delay)
+            else:
+                delay = policy.backoff(attempt)
+            attempt += 1
+            if on_retry is not None:
+                on_retry(e)
+            time.sleep(delay)
@@ -1,18 +1,25 @@
-import requests
 from typing import List
-from .base import BaseTranslator, TranslationResult, TranslatorFactory
+from .base import BaseTranslator, RequestLimits, TranslationResult, TranslatorFactory
+from .http import SessionMixin
+from .ratelimit import is_request_wide
 
-class YandexTranslator(BaseTranslator):
+class YandexTranslator(SessionMixin, BaseTranslator):
     """Yandex Translate API implementation."""
     
-    def __init__(self, api_key: str):
+    provider = 'yandex'
+    
+    # Translate v2: up to 10,000 characters per request
+    request_limits = RequestLimits(max_chars=10000)
+    
+    def __init__(self, api_key: str, pool_size: int = 10, timeout: float = 60, base_url: str = 'https://translate.api.cloud.yandex.net/translate/v2', compress_requests: bool = False):
         """Initialize with Yandex Translate API key."""
         self.api_key = api_key
-        self.base_url = 'https://translate.api.cloud.yandex.net/translate/v2'
+        self.base_url = base_url.rstrip('/')
         self.headers = {
             'Authorization': f'Api-Key {api_key}',
             'Content-Type': 'application/json'
         }
+        self._init_session(self.headers, pool_size, timeout, compress_requests)
     
     def translate(self, text: str, target_language: str, source_language: str = None) -> TranslationResult:
         try:
@@ -24,8 +31,7 @@ class YandexTranslator(BaseTranslator):
             if source_language:
                 body['sourceLanguageCode'] = source_language
             
-            response = requests.post(url, headers=self.headers, json=body)
-            response.raise_for_status()
+            response = self._post(url, body, [text])
             
             result = response.json()['translations'][0]
             return TranslationResult(
@@ -41,7 +47,7 @@ class YandexTranslator(BaseTranslator):
                 original_text=text,
                 translated_text=text,
                 target_language=target_language,
-                metadata={'error': str(e), 'provider': 'yandex'}
+                metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'yandex'}
             )
     
     def batch_translate(self, texts: List[str], target_language: str, source_language: str = None) -> List[TranslationResult]:
@@ -54,8 +60,7 @@ class YandexTranslator(BaseTranslator):
             if source_language:
                 body['sourceLanguageCode'] = source_language
             
-            response = requests.post(url, headers=self.headers, json=body)
-            response.raise_for_status()
+            response = self._post(url, body, texts)
             
             results = []
             for text, translation in zip(texts, response.json()['translations']):
@@ -74,7 +79,7 @@ class YandexTranslator(BaseTranslator):
                     original_text=text,
                     translated_text=text,
                     target_language=target_language,
-                    metadata={'error': str(e), 'provider': 'yandex'}
+                    metadata={'error': str(e), 'request_wide': is_request_wide(e), 'provider': 'yandex'}
                 )
                 for text in texts
             ]